@@ -0,0 +1,313 @@
+"""
+Run scrap_ids, scrap_details, the review filters and the database layer end to end against a local stub of LinkedIn.
+
+The stub serves the sanitized pages of fixtures/ from a separate process: search pages listing `--jobs` generated
+IDs, and job pages cycling through the JOB_PAGES fixtures with a reference number added to each description. Every
+response is delayed by `--latency` ms, and a fraction `--throttle_rate` of them are 429 "Too Many Requests" pages.
+The scraper runs with the HTTP engine on a fresh database in a temporary directory, so no browser and no network
+access are needed. The settings that change the work measured (parser, batching, compression, languages...) are
+pinned in BENCHMARK_CONFIG rather than read from config.yml, so that results stay comparable across commits.
+
+The script reports the throughput of every stage, the latency percentiles of the page requests, the peak RSS and the
+database size, and appends them to a results file with the git commit and the parameters, so runs of different
+commits can be compared. The previous result with the same parameters is printed next to the new one. The default
+results file, benchmarks/results.jsonl, is ignored by git.
+
+Usage: python benchmarks/end_to_end.py [--jobs <N>] [--workers <N>] [--latency <ms>] [--throttle_rate <0-1>]
+                                       [--max_rate <requests/min>] [--output <results.jsonl>]
+"""
+import copy
+import datetime
+import getopt
+import json
+import multiprocessing
+import os
+import random
+import re
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import yaml
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from main import HttpFetcher, RateLimiter, ScrapLinkedin  # noqa: E402
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+RESULTS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results.jsonl")
+FIRST_JOB_ID = 3900000000
+PAGE_SIZE = 25
+
+# The deleted page is left out, it would need a browser
+JOB_PAGES = ["job_view_closed.html", "job_view_hybrid_contract.html", "job_view_portuguese.html",
+             "job_view_remote_fulltime.html"]
+
+# Everything in config.yml that changes the work measured; the stub URL, workers, rate and database path are set by
+# write_config()
+BENCHMARK_CONFIG = {
+    "credentials": {"user": "", "password": ""},
+    "scraping": {"engine": "http", "parser": "selectolax", "incremental": False, "known_pages_to_stop": 1},
+    "archive": {"enabled": False},
+    "metrics": {"path": None},
+    "database": {"batch_size": 500, "flush_interval": 5, "chunk_size": 500, "compression": "zstd",
+                 "compression_level": 6, "dictionary_size": 65536, "train_after": 1000},
+    "work_queue": {"claim_batch": 5, "lease_seconds": 600, "max_attempts": 5, "backoff_seconds": 300,
+                   "max_backoff_seconds": 86400},
+    "language": {"languages": ["en", "pt", "es", "fr", "de", "it"], "processes": None},
+    "review": {"lookahead": 4},
+    "scheduler": {"concurrent_queries": 2, "scrap_details": True},
+    # The stub pages are near-duplicates of a few fixtures: deduplication would leave almost nothing to detect
+    # languages on and filter
+    "dedupe": {"enabled": False},
+}
+
+
+def read_fixture(name):
+    with open(os.path.join(FIXTURES_DIR, name), "r", encoding="utf-8") as f:
+        return f.read()
+
+
+class StubLinkedin:
+    """
+    Pages of the stub, built from the fixtures.
+
+    Args:
+        jobs (int): Number of jobs listed by the search.
+        latency (float): Delay in seconds before every response.
+        throttle_rate (float): Fraction of the responses replaced by a 429 page, never twice in a row for one URL.
+    """
+
+    def __init__(self, jobs, latency, throttle_rate, seed=7):
+        self.jobs = jobs
+        self.latency = latency
+        self.throttle_rate = throttle_rate
+        self.random = random.Random(seed)
+        self.throttled_paths = set()
+        self.lock = threading.Lock()
+
+        search = read_fixture("search_results.html")
+        first_item, last_item_end = search.index('<li id="ember'), search.rindex("</li>") + len("</li>")
+        items = search[first_item:last_item_end]
+        self.search_head = re.sub(r"[\d,]+ results", f"{jobs:,} results", search[:first_item])
+        self.search_item = items[:items.index("</div></li>") + len("</div></li>")]
+        self.search_tail = search[last_item_end:]
+        self.template_id = re.search(r'data-occludable-job-id="(\d+)"', self.search_item).group(1)
+
+        self.job_pages = [read_fixture(name) for name in JOB_PAGES]
+
+    def search_page(self, start):
+        ids = [FIRST_JOB_ID + self.jobs - position for position in range(start, min(start + PAGE_SIZE, self.jobs))]
+        items = [self.search_item.replace(self.template_id, str(job_id)) for job_id in ids]
+        return self.search_head + "\n".join(items) + self.search_tail
+
+    def job_page(self, job_id):
+        page = self.job_pages[job_id % len(self.job_pages)]
+        return re.sub(r'(<div class="jobs-box__html-content[^>]*>)', rf"\1<p>Reference {job_id}.</p>", page, count=1)
+
+    def respond(self, path):
+        """Status and body for `path`."""
+        time.sleep(self.latency)
+        with self.lock:
+            if path not in self.throttled_paths and self.random.random() < self.throttle_rate:
+                self.throttled_paths.add(path)
+                return 429, "<html><body><h1>Too Many Requests</h1></body></html>"
+            self.throttled_paths.discard(path)
+        url = urlparse(path)
+        if url.path.startswith("/jobs/search"):
+            return 200, self.search_page(int(parse_qs(url.query).get("start", ["0"])[0]))
+        match = re.match(r"/jobs/view/(\d+)", url.path)
+        if match:
+            return 200, self.job_page(int(match.group(1)))
+        return 404, "<html><body>Not found</body></html>"
+
+
+def serve(params, port_pipe):
+    """Serve a StubLinkedin for the benchmark `params` on a free local port, sent back through `port_pipe`."""
+    stub = StubLinkedin(params["jobs"], params["latency"] / 1000, params["throttle_rate"])
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            status, body = stub.respond(self.path)
+            data = body.encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    port_pipe.send(server.server_address[1])
+    server.serve_forever()
+
+
+def percentiles(values, points=(50, 90, 95, 99)):
+    values = sorted(values)
+    if not values:
+        return {f"p{point}": None for point in points}
+    return {f"p{point}": round(values[min(len(values) - 1, int(len(values) * point / 100))] * 1000, 2)
+            for point in points}
+
+
+def git_commit():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_DIR, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=REPO_DIR,
+                               capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return f"{commit}-dirty" if dirty else commit
+
+
+def write_config(directory, base_url, workers, max_rate):
+    """BENCHMARK_CONFIG, pointed at the stub and a fresh database in `directory`."""
+    config = copy.deepcopy(BENCHMARK_CONFIG)
+    config["scraping"].update(base_url=base_url, workers=workers, max_requests_per_minute=max_rate,
+                              min_requests_per_minute=max_rate / 10)
+    config["database"]["path"] = os.path.join(directory, "jobs.db")
+    with open(os.path.join(directory, "config.yml"), "w") as f:
+        yaml.safe_dump(config, f)
+
+
+def run(params):
+    receiver, sender = multiprocessing.Pipe(duplex=False)
+    server = multiprocessing.Process(target=serve, args=(params, sender), daemon=True)
+    server.start()
+    port = receiver.recv()
+
+    directory = tempfile.mkdtemp(prefix="scrap_bench_")
+    cwd = os.getcwd()
+    os.chdir(directory)
+    try:
+        write_config(directory, f"http://127.0.0.1:{port}", params["workers"], params["max_rate"])
+        scrap = ScrapLinkedin("data engineer", "Brazil")
+        scrap.rate_limiter = RateLimiter(params["max_rate"], params["max_rate"] / 10, start_per_minute=params["max_rate"],
+                                         base_backoff=0.05, max_backoff=1.0)
+        scrap.http_fetcher = HttpFetcher(pool_size=max(params["workers"], 10))
+
+        latencies = []
+        fetch = scrap.http_fetcher.get
+
+        def timed_get(url):
+            start = time.perf_counter()
+            try:
+                return fetch(url)
+            finally:
+                latencies.append(time.perf_counter() - start)
+        scrap.http_fetcher.get = timed_get
+
+        stages = {}
+        with scrap:
+            start = time.perf_counter()
+            scrap.scrap_ids()
+            scrap.writer.flush()
+            stages["scrap_ids"] = time.perf_counter() - start
+            search_requests = len(latencies)
+
+            start = time.perf_counter()
+            scrap.scrap_details()
+            stages["scrap_details"] = time.perf_counter() - start
+
+            start = time.perf_counter()
+            filtered = scrap.prefilter_jobs()
+            candidates = sum(1 for job in scrap.fetch_jobs())
+            stages["filter"] = time.perf_counter() - start
+
+            counts = dict(scrap.conn.execute("""
+                SELECT 'jobs', COUNT(*) FROM jobs UNION ALL
+                SELECT 'with_details', COUNT(*) FROM jobs WHERE details_pending = 0 UNION ALL
+                SELECT 'with_language', COUNT(*) FROM jobs WHERE language IS NOT NULL
+            """).fetchall())
+            throttles = scrap.rate_limiter.report()["throttles"]
+
+        db_size = sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory)
+                      if name.startswith("jobs.db"))
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(directory, ignore_errors=True)
+        server.terminate()
+
+    peak_rss_kb = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+                      resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    return {
+        "jobs": counts["jobs"],
+        "jobs_with_details": counts["with_details"],
+        "jobs_with_language": counts["with_language"],
+        "filtered": filtered,
+        "review_candidates": candidates,
+        "requests": len(latencies),
+        "throttles": throttles,
+        "seconds": {name: round(seconds, 3) for name, seconds in stages.items()},
+        "search_pages_per_second": round(search_requests / stages["scrap_ids"], 2),
+        "jobs_per_second": round(counts["with_details"] / stages["scrap_details"], 2),
+        "request_latency_ms": percentiles(latencies),
+        "peak_rss_mb": round(peak_rss_kb / 1024, 1),
+        "db_size_mb": round(db_size / 1024 / 1024, 2),
+    }
+
+
+def previous_result(output, params):
+    if not os.path.exists(output):
+        return None
+    previous = None
+    with open(output, "r") as f:
+        for line in f:
+            record = json.loads(line)
+            if record["params"] == params:
+                previous = record
+    return previous
+
+
+def main(argv):
+    params = {"jobs": 500, "workers": 4, "latency": 50.0, "throttle_rate": 0.02, "max_rate": 6000.0}
+    output = RESULTS_FILE
+    opts, args = getopt.getopt(argv, "", ["jobs=", "workers=", "latency=", "throttle_rate=", "max_rate=", "output="])
+    for opt, arg in opts:
+        if opt == "--output":
+            output = arg
+        else:
+            name = opt[2:]
+            params[name] = type(params[name])(arg)
+
+    previous = previous_result(output, params)
+    results = run(params)
+    record = {"commit": git_commit(), "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+              "python": sys.version.split()[0], "params": params, "results": results}
+    with open(output, "a") as f:
+        f.write(json.dumps(record) + "\n")
+
+    print(f"commit {record['commit']}, params {params}")
+    rows = [("search pages/s", "search_pages_per_second"), ("jobs/s", "jobs_per_second"),
+            ("peak RSS MB", "peak_rss_mb"), ("db size MB", "db_size_mb")]
+    rows += [(f"{stage} s", ("seconds", stage)) for stage in results["seconds"]]
+    rows += [(f"request {point} ms", ("request_latency_ms", point)) for point in results["request_latency_ms"]]
+
+    def value(result, key):
+        return result[key[0]][key[1]] if isinstance(key, tuple) else result[key]
+
+    print(f"{'metric':<20}{'this run':>12}{'previous':>12}")
+    for label, key in rows:
+        before = value(previous["results"], key) if previous else None
+        print(f"{label:<20}{value(results, key):>12}{'' if before is None else before:>12}")
+    print(f"{results['jobs']} jobs, {results['jobs_with_details']} with details, {results['requests']} requests, "
+          f"{results['throttles']} throttles, {results['filtered']} filtered, {results['review_candidates']} to review")
+    print(f"Saved to {output}" + (f", previous run: commit {previous['commit']}" if previous else ""))
+    return 0 if results["jobs_with_details"] == results["jobs"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
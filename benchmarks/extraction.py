@@ -0,0 +1,222 @@
+"""
+Compare the JobExtractor backends with the original BeautifulSoup code on the saved pages in fixtures/.
+
+Every backend must produce exactly the same fields as the original code; the script exits with status 1 otherwise.
+It then reports the mean parse time per page of each implementation.
+
+When Chrome can be started, the job pages are also loaded in a headless browser and extracted with
+JobExtractor.BROWSER_SCRIPT, the path of the Selenium engine, which must return the same fields too. --no_browser
+skips it.
+
+Usage: python benchmarks/extraction.py [--iterations <N>] [--no_browser]
+"""
+import getopt
+import os
+import sys
+import tempfile
+import time
+
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import JobExtractor  # noqa: E402
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def original_job(html, job_id):
+    """Field extraction of scrap_details before JobExtractor, without language detection and date parsing."""
+    soup = BeautifulSoup(html, "html.parser")
+    job = {"Job_ID": job_id}
+
+    try:
+        job["Job_txt"] = soup.find("div",
+                                   class_="jobs-box__html-content jobs-description-content__text t-14 t-normal jobs-description-content__text--stretch").text
+    except:
+        job["Job_txt"] = None
+
+    try:
+        job["company"] = soup.find("div", class_="job-details-jobs-unified-top-card__company-name").text.replace("\n", "")
+    except:
+        job["company"] = None
+
+    try:
+        job["job_title"] = soup.find("div", class_="t-24 job-details-jobs-unified-top-card__job-title").text.replace("\n", "")
+    except:
+        job["job_title"] = None
+
+    location_details = soup.find("div", class_="job-details-jobs-unified-top-card__tertiary-description")
+
+    try:
+        job["location"] = location_details.contents[1].text
+    except:
+        job["location"] = None
+
+    try:
+        job["posted_time_ago"] = location_details.contents[3].text
+    except:
+        job["posted_time_ago"] = None
+
+    try:
+        job["nb_candidats"] = location_details.contents[5].text
+    except:
+        job["nb_candidats"] = None
+
+    try:
+        job["fit"] = soup.find("div", class_="display-flex flex-row align-items-center mt4").text.replace("\n", "").strip()
+    except:
+        job["fit"] = None
+
+    li_tags = soup.find_all('li', class_='job-details-jobs-unified-top-card__job-insight')
+    try:
+        if len(li_tags[1].get_text(strip=True).split("·")) == 2:
+            job["employes"] = li_tags[1].get_text(strip=True).split("·")[0]
+            job["sector"] = li_tags[1].get_text(strip=True).split("·")[1].strip()
+        else:
+            job["employes"] = li_tags[1].get_text(strip=True)
+            job["sector"] = None
+    except:
+        job["employes"] = None
+        job["sector"] = None
+
+    def first_line(tag):
+        return tag.get_text("\n", strip=True).split("\n")[0] if tag else ''
+
+    elements = [span for span in soup.find_all("span")
+                if span.get("class") == ["job-details-jobs-unified-top-card__job-insight-view-model-secondary"]]
+    if not elements:
+        job["type_work"] = job["time_work"] = job["level"] = ''
+    elif len(elements) <= 2:
+        job["type_work"] = first_line(soup.find("span", class_="ui-label--accent-3"))
+        job["time_work"] = first_line(elements[0])
+        job["level"] = first_line(elements[1]) if len(elements) > 1 else ''
+    else:
+        job["type_work"] = first_line(elements[0])
+        job["time_work"] = first_line(elements[1])
+        job["level"] = first_line(elements[2])
+    return job
+
+
+def original_search_page(html):
+    soup = BeautifulSoup(html, "html.parser")
+    try:
+        div_number_of_jobs = soup.find("div", {"class": "jobs-search-results-list__subtitle"})
+        number_of_jobs = int(div_number_of_jobs.find("span").get_text().strip().split()[0].replace(",", ""))
+    except:
+        number_of_jobs = 0
+    job_postings = soup.find_all("li", {"class": "jobs-search-results__list-item"})
+    return number_of_jobs, [job_posting.get("data-occludable-job-id") for job_posting in job_postings]
+
+
+def original_liveness(html):
+    soup = BeautifulSoup(html, "html.parser")
+    text = soup.find("span", {"class": "artdeco-inline-feedback__message"})
+    tittle = soup.select_one(".t-24.job-details-jobs-unified-top-card__job-title")
+    return tittle is not None, text.get_text(strip=True) if text else ''
+
+
+def load_fixtures():
+    fixtures = {}
+    for name in sorted(os.listdir(FIXTURES_DIR)):
+        if name.endswith(".html"):
+            with open(os.path.join(FIXTURES_DIR, name), "r", encoding="utf-8") as f:
+                fixtures[name] = f.read()
+    return fixtures
+
+
+def start_browser():
+    """Headless Chrome, or None when Selenium cannot start it."""
+    try:
+        from selenium import webdriver
+        options = webdriver.ChromeOptions()
+        options.add_argument("--headless=new")
+        options.add_argument("--window-size=1366,900")
+        return webdriver.Chrome(options=options)
+    except Exception as e:
+        print(f"browser: skipped, Chrome could not be started ({type(e).__name__})")
+        return None
+
+
+def browser_job(driver, directory, html):
+    """Fields of `html` extracted in `driver` by JobExtractor.BROWSER_SCRIPT, as in read_job_details_selenium."""
+    path = os.path.join(directory, "page.html")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(html)
+    driver.get(f"file://{path}")
+    return JobExtractor().extract_rendered_job(driver, 0)
+
+
+def implementations(driver=None, directory=None):
+    """Name and (search page, job page, liveness) functions of every implementation to compare."""
+    result = {"original": (original_search_page, lambda html: original_job(html, 0), original_liveness)}
+    backends = ["bs4"] + (["selectolax"] if JobExtractor().backend == "selectolax" else [])
+    for backend in backends:
+        extractor = JobExtractor(backend)
+        result[backend] = (extractor.extract_search_page,
+                           lambda html, extractor=extractor: extractor.extract_job(html, 0),
+                           extractor.extract_liveness)
+    if driver is not None:
+        # Search pages and liveness are always parsed from HTML; only the job fields come from the browser
+        extractor = JobExtractor()
+        result["browser"] = (extractor.extract_search_page, lambda html: browser_job(driver, directory, html),
+                             extractor.extract_liveness)
+    return result
+
+
+def extract(functions, name, html):
+    search_page, job_page, liveness = functions
+    if name.startswith("search"):
+        return search_page(html)
+    return job_page(html), liveness(html)
+
+
+def main(argv):
+    iterations = 20
+    browser = True
+    opts, args = getopt.getopt(argv, "", ["iterations=", "no_browser"])
+    for opt, arg in opts:
+        if opt == "--iterations":
+            iterations = int(arg)
+        elif opt == "--no_browser":
+            browser = False
+
+    fixtures = load_fixtures()
+    driver = start_browser() if browser else None
+    with tempfile.TemporaryDirectory(prefix="extraction_") as directory:
+        try:
+            return compare(fixtures, implementations(driver, directory), iterations)
+        finally:
+            if driver is not None:
+                driver.quit()
+
+
+def compare(fixtures, impls, iterations):
+    mismatches = 0
+    for name, html in fixtures.items():
+        expected = extract(impls["original"], name, html)
+        for impl_name, functions in impls.items():
+            if impl_name == "original":
+                continue
+            got = extract(functions, name, html)
+            if got != expected:
+                mismatches += 1
+                print(f"MISMATCH {impl_name} on {name}:\n  expected {expected}\n  got      {got}")
+
+    print(f"{len(fixtures)} fixtures, {len(impls) - 1} backend(s), {mismatches} mismatch(es)")
+    print(f"{'implementation':<16}{'ms/page':>10}{'speedup':>10}")
+    baseline = None
+    for impl_name, functions in impls.items():
+        start = time.perf_counter()
+        for _ in range(iterations):
+            for name, html in fixtures.items():
+                extract(functions, name, html)
+        per_page = (time.perf_counter() - start) * 1000 / (iterations * len(fixtures))
+        baseline = baseline or per_page
+        print(f"{impl_name:<16}{per_page:>10.2f}{baseline / per_page:>9.1f}x")
+
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -1,17 +1,11 @@
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
-from bs4 import BeautifulSoup
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from urllib.parse import urlparse
+# selenium, bs4, requests, langid, selectolax, zstandard and pyarrow are imported where they are used, so that
+# database-only commands (stats, export, lang...) start fast and never load a browser driver or the language model
+from urllib.parse import urlparse, quote
 from datetime import timedelta
 
 import sqlite3
 import yaml
 import time
-import requests
 import math
 import logging
 import random
@@ -20,9 +14,26 @@ import json
 import os
 import re
 import pytz
-import langid
 import sys
 import getopt
+import threading
+import queue
+import gzip
+import zlib
+import hashlib
+import socket
+import atexit
+import contextlib
+import functools
+import cProfile
+import pstats
+import io
+import csv
+import collections
+import itertools
+import array
+import importlib.util
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
@@ -34,6 +45,1247 @@ def read_yaml(file_path="config.yml"):
     return config
 
 
+DEFAULT_USER_AGENT = ("Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) "
+                      "Chrome/119.0.0.0 Safari/537.36")
+
+
+class Metrics:
+    """
+    Thread-safe counters, gauges and latency histograms of a run.
+
+    Metrics are identified by a name and optional labels, e.g. `metrics.inc("pages_fetched_total", engine="http")`.
+    Histograms use the cumulative buckets of Prometheus, so write() can export a Prometheus text file (".prom")
+    that node_exporter's textfile collector picks up, or a JSON snapshot (any other extension).
+
+    Args:
+        buckets (tuple, optional): Upper bounds in seconds of the histogram buckets. Default is BUCKETS.
+    """
+
+    BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+    def __init__(self, buckets=None):
+        self.buckets = tuple(buckets or self.BUCKETS)
+        self.started = time.time()
+        self.counters = {}
+        self.gauges = {}
+        self.histograms = {}
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def key(name, labels):
+        return name, tuple(sorted(labels.items()))
+
+    def inc(self, name, value=1, **labels):
+        key = self.key(name, labels)
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def set(self, name, value, **labels):
+        with self.lock:
+            self.gauges[self.key(name, labels)] = value
+
+    def observe(self, name, value, **labels):
+        key = self.key(name, labels)
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = {"buckets": [0] * len(self.buckets), "count": 0, "sum": 0.0,
+                                                    "max": 0.0}
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    histogram["buckets"][i] += 1
+            histogram["count"] += 1
+            histogram["sum"] += value
+            histogram["max"] = max(histogram["max"], value)
+
+    @contextlib.contextmanager
+    def timer(self, name, **labels):
+        """Observe the duration of the `with` block in the histogram `name`."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def summary(self, name, **labels):
+        """Count and mean/max of a histogram."""
+        with self.lock:
+            histogram = self.histograms.get(self.key(name, labels))
+            if not histogram:
+                return {"count": 0, "mean": None, "max": None}
+            return {"count": histogram["count"], "mean": round(histogram["sum"] / histogram["count"], 3),
+                    "max": round(histogram["max"], 3)}
+
+    def snapshot(self):
+        """Every metric as a JSON-serializable dict, with the uptime and the pages fetched per second."""
+        uptime = time.time() - self.started
+        with self.lock:
+            pages = sum(value for (name, labels), value in self.counters.items() if name == "pages_fetched_total")
+            gauges = dict(self.gauges)
+            gauges[("uptime_seconds", ())] = round(uptime, 3)
+            gauges[("pages_per_second", ())] = round(pages / uptime, 4) if uptime else 0.0
+
+            def entries(metrics, value=lambda v: v):
+                return [{"name": name, "labels": dict(labels), "value": value(v)}
+                        for (name, labels), v in sorted(metrics.items())]
+
+            return {"timestamp": datetime.datetime.now(pytz.utc).isoformat(),
+                    "counters": entries(self.counters), "gauges": entries(gauges),
+                    "histograms": entries(self.histograms, lambda h: dict(h, bounds=list(self.buckets)))}
+
+    def prometheus(self):
+        """The snapshot in the Prometheus text exposition format."""
+        def escape(value):
+            # Label values escape backslash, double quote and line feed
+            return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+        def series(name, labels, extra=None):
+            labels = dict(labels, **(extra or {}))
+            if not labels:
+                return name
+            return name + "{" + ",".join(f'{key}="{escape(value)}"' for key, value in labels.items()) + "}"
+
+        snapshot = self.snapshot()
+        lines = []
+        for kind, metric_type in [("counters", "counter"), ("gauges", "gauge")]:
+            for name in sorted({entry["name"] for entry in snapshot[kind]}):
+                lines.append(f"# TYPE {name} {metric_type}")
+                lines += [f"{series(name, entry['labels'])} {entry['value']}"
+                          for entry in snapshot[kind] if entry["name"] == name]
+        for name in sorted({entry["name"] for entry in snapshot["histograms"]}):
+            lines.append(f"# TYPE {name} histogram")
+            for entry in snapshot["histograms"]:
+                if entry["name"] != name:
+                    continue
+                histogram = entry["value"]
+                for bound, count in zip(histogram["bounds"], histogram["buckets"]):
+                    lines.append(f"{series(name + '_bucket', entry['labels'], {'le': bound})} {count}")
+                lines.append(f"{series(name + '_bucket', entry['labels'], {'le': '+Inf'})} {histogram['count']}")
+                lines.append(f"{series(name + '_sum', entry['labels'])} {histogram['sum']}")
+                lines.append(f"{series(name + '_count', entry['labels'])} {histogram['count']}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path):
+        """Write the metrics to `path`, as Prometheus text when it ends with ".prom" and as JSON otherwise."""
+        content = self.prometheus() if path.endswith(".prom") else json.dumps(self.snapshot(), indent=2)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+
+
+def stage(name):
+    """Time a ScrapLinkedin method as the stage `name`, counting its runs and failures."""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            status = "error"
+            try:
+                with self.metrics.timer("stage_seconds", stage=name):
+                    result = method(self, *args, **kwargs)
+                status = "ok"
+                return result
+            finally:
+                self.metrics.inc("stage_runs_total", stage=name, status=status)
+        return wrapper
+    return decorator
+
+
+class RateLimiter:
+    """
+    Adaptive request rate shared by every fetch path and every worker.
+
+    A token bucket paces the requests. The rate grows additively while responses are healthy and is cut
+    multiplicatively (AIMD) when LinkedIn throttles, each throttle also pausing every caller with an exponential
+    backoff. After `breaker_threshold` throttles in a row the circuit opens and nothing is requested for `max_backoff`.
+
+    Args:
+        max_per_minute (float): Ceiling of the request rate.
+        min_per_minute (float, optional): Floor of the request rate. Default is a tenth of the ceiling.
+        start_per_minute (float, optional): Initial request rate. Default is half of the ceiling.
+        increase (float, optional): Requests per minute added after each healthy response. Default is 1.
+        decrease (float, optional): Factor applied to the rate on each throttle. Default is 0.5.
+        base_backoff (float, optional): Pause in seconds after the first throttle, doubled on each one in a row. Default is 15.
+        max_backoff (float, optional): Longest pause in seconds, also used while the circuit is open. Default is 300.
+        breaker_threshold (int, optional): Throttles in a row that open the circuit. Default is 4.
+        jitter (float, optional): Random fraction added to each interval so requests are not evenly spaced. Default is 0.2.
+    """
+
+    def __init__(self, max_per_minute, min_per_minute=None, start_per_minute=None, increase=1.0, decrease=0.5,
+                 base_backoff=15.0, max_backoff=300.0, breaker_threshold=4, jitter=0.2):
+        self.max_rate = max_per_minute
+        # A floor above the ceiling (e.g. --max_rate below min_requests_per_minute) would break the cap
+        self.min_rate = min(min_per_minute or max_per_minute / 10, max_per_minute)
+        self.rate = min(self.max_rate, max(self.min_rate, start_per_minute or max_per_minute / 2))
+        self.increase = increase
+        self.decrease = decrease
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.breaker_threshold = breaker_threshold
+        self.jitter = jitter
+        self.next_slot = time.monotonic()
+        self.blocked_until = 0.0
+        self.consecutive_throttles = 0
+        self.throttle_count = 0
+        self.lock = threading.Lock()
+
+    def acquire(self, cancel=None):
+        """
+        Block until the caller may send its next request.
+
+        Args:
+            cancel (threading.Event, optional): Stops the wait as soon as it is set.
+
+        Returns:
+            bool: False when `cancel` was set before the request could be sent.
+        """
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot, self.blocked_until)
+            self.next_slot = slot + 60.0 / self.rate * (1 + random.uniform(0, self.jitter))
+        wait = slot - now
+        if cancel is not None:
+            return not cancel.wait(max(wait, 0))
+        if wait > 0:
+            time.sleep(wait)
+        return True
+
+    def success(self):
+        """Record a healthy response."""
+        with self.lock:
+            self.consecutive_throttles = 0
+            self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def throttled(self):
+        """Record a 429 / "Too Many Requests" response and back off."""
+        with self.lock:
+            self.throttle_count += 1
+            self.consecutive_throttles += 1
+            self.rate = max(self.min_rate, self.rate * self.decrease)
+            if self.consecutive_throttles >= self.breaker_threshold:
+                backoff = self.max_backoff
+                logging.error(f"Circuit open after {self.consecutive_throttles} throttles in a row, pausing {backoff:.0f}s")
+            else:
+                backoff = min(self.max_backoff, self.base_backoff * 2 ** (self.consecutive_throttles - 1))
+                logging.warning(f"Throttled, pausing {backoff:.0f}s and slowing down to {self.rate:.1f} requests/min")
+            self.blocked_until = max(self.blocked_until, time.monotonic() + backoff)
+
+    @property
+    def circuit_open(self):
+        return self.consecutive_throttles >= self.breaker_threshold and time.monotonic() < self.blocked_until
+
+    def report(self):
+        """Current state, for logs and metrics."""
+        return {
+            "rate_per_minute": round(self.rate, 2),
+            "throttles": self.throttle_count,
+            "consecutive_throttles": self.consecutive_throttles,
+            "circuit_open": self.circuit_open,
+        }
+
+
+class HttpFetcher:
+    """
+    Browserless page fetcher backed by one persistent, connection-pooled requests.Session.
+
+    Args:
+        cookies_file (str, optional): Cookies saved by Selenium, used to authenticate the session. Default is "cookies.json".
+        pool_size (int, optional): Number of keep-alive connections kept per host. Default is 10.
+        user_agent (str, optional): User-Agent header, so LinkedIn serves the same markup as to Chrome.
+        timeout (float, optional): Timeout in seconds for each request. Default is 20.
+    """
+
+    def __init__(self, cookies_file="cookies.json", pool_size=10, user_agent=None, timeout=20):
+        import requests
+
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            "User-Agent": user_agent or DEFAULT_USER_AGENT,
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+            "Accept-Encoding": "gzip, deflate",
+            "Accept-Language": "en-US,en;q=0.9",
+            "Connection": "keep-alive",
+        })
+        if os.path.exists(cookies_file):
+            self.load_cookies(cookies_file)
+
+    def load_cookies(self, cookies_file):
+        with open(cookies_file, "r") as f:
+            cookies = json.load(f)
+        for cookie in cookies:
+            self.session.cookies.set(cookie['name'], cookie['value'], domain=cookie.get('domain', ''),
+                                     path=cookie.get('path', '/'))
+
+    def get(self, url):
+        """Fetch `url` and return the status code and the decoded body."""
+        response = self.session.get(url, timeout=self.timeout)
+        return response.status_code, response.text
+
+
+class JobFilter:
+    """
+    Exclusion rules for the review queue, compiled once into one regular expression per field.
+
+    A job is rejected when its title contains one of `exclude_title` or its description one of
+    `exclude_description` (case-insensitive substring match, like the original keyword loops).
+
+    Args:
+        exclude_title (list): Keywords rejected in job titles.
+        exclude_description (list): Keywords rejected in job descriptions.
+    """
+
+    def __init__(self, exclude_title, exclude_description):
+        self.title_pattern = self.compile(exclude_title)
+        self.description_pattern = self.compile(exclude_description)
+
+    @staticmethod
+    def compile(keywords):
+        keywords = sorted({keyword.lower() for keyword in keywords if keyword}, key=len, reverse=True)
+        return re.compile("|".join(re.escape(keyword) for keyword in keywords)) if keywords else None
+
+    def rejects(self, title, description):
+        if self.title_pattern and title and self.title_pattern.search(title.lower()):
+            return True
+        if self.description_pattern and description and self.description_pattern.search(description.lower()):
+            return True
+        return False
+
+
+class DbWriter:
+    """
+    Buffered, thread-safe writer for the jobs database.
+
+    Statements are queued and flushed with `executemany` in one transaction once `batch_size` rows are pending, and
+    at least every `flush_interval` seconds by a background thread. Consecutive rows of the same statement are
+    batched together, so writes are applied in the order they were queued. Call flush() before reading rows that
+    may still be pending, and close() on shutdown. A batch that fails because another connection holds the database
+    lock stays pending for the next flush; one rejected for its data is written row by row, skipping the bad rows.
+
+    Args:
+        conn (sqlite3.Connection): Connection opened with `check_same_thread=False`.
+        batch_size (int, optional): Pending rows that trigger a flush. Default is 500.
+        flush_interval (float, optional): Longest time in seconds a row stays pending. Default is 5.
+        metrics (Metrics, optional): Receives the flush durations and the rows written.
+    """
+
+    def __init__(self, conn, batch_size=500, flush_interval=5.0, metrics=None):
+        self.conn = conn
+        self.metrics = metrics or Metrics()
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.pending = []
+        self.pending_rows = 0
+        self.lock = threading.RLock()
+        self.stopped = threading.Event()
+        self.flusher = threading.Thread(target=self.flush_periodically, daemon=True)
+        self.flusher.start()
+
+    def add(self, sql, params):
+        self.add_many(sql, [params])
+
+    def add_many(self, sql, rows):
+        with self.lock:
+            for params in rows:
+                if self.pending and self.pending[-1][0] == sql:
+                    self.pending[-1][1].append(params)
+                else:
+                    self.pending.append((sql, [params]))
+                self.pending_rows += 1
+            if self.pending_rows >= self.batch_size:
+                self.flush()
+
+    def flush(self):
+        """Write every pending row in one transaction."""
+        with self.lock:
+            if not self.pending:
+                return
+            batches, rows_count, self.pending, self.pending_rows = self.pending, self.pending_rows, [], 0
+            start = time.perf_counter()
+            try:
+                for sql, rows in batches:
+                    self.conn.executemany(sql, rows)
+                self.conn.commit()
+            except sqlite3.Error as e:
+                self.conn.rollback()
+                self.metrics.inc("db_flush_errors_total")
+                if self.is_locked(e):
+                    # The same rows would hit the same lock one by one: keep them, in order, for the next flush
+                    self.pending, self.pending_rows = batches + self.pending, rows_count + self.pending_rows
+                    logging.warning(f"Batch write failed ({repr(e)}), keeping {rows_count} rows for the next flush")
+                    return
+                logging.error(f"Batch write failed ({repr(e)}), retrying row by row")
+                self.write_one_by_one(batches)
+            self.metrics.observe("db_flush_seconds", time.perf_counter() - start)
+            self.metrics.inc("db_rows_written_total", rows_count)
+
+    @staticmethod
+    def is_locked(error):
+        """Whether `error` comes from a lock held by another connection, so the write succeeds once it is released."""
+        message = str(error).lower()
+        return isinstance(error, sqlite3.OperationalError) and ("locked" in message or "busy" in message)
+
+    def write_one_by_one(self, batches):
+        for sql, rows in batches:
+            for params in rows:
+                try:
+                    self.conn.execute(sql, params)
+                except sqlite3.Error as e:
+                    logging.error(f"{repr(e)} writing {params[:1]}")
+        self.conn.commit()
+
+    def flush_periodically(self):
+        while not self.stopped.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                logging.error(f"Periodic flush failed: {repr(e)}")
+
+    def close(self):
+        self.stopped.set()
+        self.flush()
+
+
+class WorkQueue:
+    """
+    Durable queue of the jobs whose details must be read, shared by every process using the database.
+
+    Workers claim items in batches with a lease: a single UPDATE ... RETURNING marks the ready items with the highest
+    priority (then the newest Job_ID) as leased by this process for `lease_seconds`, so two workers never claim the
+    same item, even from different processes. An item whose lease expired (its worker crashed or was killed) is ready
+    again. A failed item is retried after an exponential backoff, and dead-lettered with its last error after
+    `max_attempts` attempts. Completions and failures are written through `writer`, in the same transactions as the
+    job rows.
+
+    Args:
+        writer (DbWriter): Writer of the jobs database; its connection and lock are also used for the claims.
+        lease_seconds (float, optional): How long a claimed item is reserved. Default is 600.
+        max_attempts (int, optional): Attempts before an item is dead-lettered. Default is 5.
+        backoff (float, optional): Delay in seconds before the first retry, doubled after every failure. Default is 300.
+        max_backoff (float, optional): Longest delay in seconds between two attempts. Default is 86400.
+    """
+
+    READY_QUERY = '''
+            SELECT Job_ID FROM work_queue
+            WHERE state IN ('pending', 'leased') AND available_at <= ?
+            ORDER BY priority DESC, Job_ID DESC LIMIT ?
+            '''
+
+    def __init__(self, writer, lease_seconds=600, max_attempts=5, backoff=300, max_backoff=86400):
+        self.writer = writer
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+
+    @staticmethod
+    def now():
+        return datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds")
+
+    def enqueue(self, select, params=(), priority=0):
+        """
+        Add the Job_IDs returned by the `select` query. Items already done are queued again, dead items are left
+        alone.
+
+        Returns:
+            int: Number of items added or queued again.
+        """
+        with self.writer.lock:
+            self.writer.flush()
+            cursor = self.writer.conn.execute(f'''
+                INSERT INTO work_queue (Job_ID, priority, updated_at)
+                SELECT Job_ID, ?, ? FROM ({select}) WHERE true
+                ON CONFLICT (Job_ID) DO UPDATE SET state = 'pending', attempts = 0, available_at = 0,
+                    last_error = NULL, updated_at = excluded.updated_at
+                WHERE state = 'done'
+            ''', (priority, self.now(), *params))
+            self.writer.conn.commit()
+        return cursor.rowcount
+
+    def claim(self, limit):
+        """
+        Lease up to `limit` ready items to this process.
+
+        Returns:
+            list: (Job_ID, attempt number) of the claimed items, highest priority first.
+        """
+        with self.writer.lock:
+            rows = self.writer.conn.execute(f'''
+                UPDATE work_queue SET state = 'leased', lease_owner = ?, available_at = ?, attempts = attempts + 1,
+                    updated_at = ?
+                WHERE Job_ID IN ({self.READY_QUERY})
+                RETURNING priority, Job_ID, attempts
+            ''', (self.owner, time.time() + self.lease_seconds, self.now(), time.time(), limit)).fetchall()
+            self.writer.conn.commit()
+        return [(job_id, attempts) for priority, job_id, attempts in sorted(rows, reverse=True)]
+
+    def complete(self, job_id):
+        self.writer.add('''
+            UPDATE work_queue SET state = 'done', lease_owner = NULL, last_error = NULL, updated_at = ?
+            WHERE Job_ID = ?
+        ''', (self.now(), job_id))
+        self.writer.metrics.inc("work_queue_items_total", outcome="done")
+
+    def fail(self, job_id, attempts, error):
+        """Retry the item `job_id` after a backoff, or dead-letter it once it failed `max_attempts` times."""
+        dead = attempts >= self.max_attempts
+        delay = min(self.max_backoff, self.backoff * 2 ** (attempts - 1))
+        self.writer.add('''
+            UPDATE work_queue SET state = ?, lease_owner = NULL, available_at = ?, last_error = ?, updated_at = ?
+            WHERE Job_ID = ? AND state = 'leased' AND lease_owner = ?
+        ''', ('dead' if dead else 'pending', time.time() + delay, error, self.now(), job_id, self.owner))
+        self.writer.metrics.inc("work_queue_items_total", outcome="dead" if dead else "retry")
+        if dead:
+            logging.warning(f"{job_id} - dead-lettered after {attempts} attempts: {error}")
+
+    def release(self):
+        """Make the items still leased by this process ready again, without counting their attempt."""
+        with self.writer.lock:
+            self.writer.flush()
+            self.writer.conn.execute('''
+                UPDATE work_queue SET state = 'pending', lease_owner = NULL, available_at = 0, attempts = attempts - 1
+                WHERE state = 'leased' AND lease_owner = ?
+            ''', (self.owner,))
+            self.writer.conn.commit()
+
+    def report(self):
+        """Number of items in every state, and of pending items ready now."""
+        with self.writer.lock:
+            self.writer.flush()
+            conn = self.writer.conn
+            report = dict(conn.execute("SELECT state, COUNT(*) FROM work_queue GROUP BY state").fetchall())
+            report["ready"] = conn.execute(f"SELECT COUNT(*) FROM ({self.READY_QUERY})", (time.time(), -1)).fetchone()[0]
+        return report
+
+
+class HtmlArchive:
+    """
+    Compressed, content-addressed archive of fetched job pages.
+
+    Each page is gzip-compressed and stored once under `<root>/<first two hex digits>/<sha256>.html.gz`; the
+    `page_archive` table maps every (Job_ID, fetched_at) to the digest of the page fetched at that time.
+
+    Args:
+        root (str, optional): Directory of the archive. Default is "archive".
+    """
+
+    def __init__(self, root="archive"):
+        self.root = root
+
+    def path(self, digest):
+        return os.path.join(self.root, digest[:2], f"{digest}.html.gz")
+
+    def put(self, html):
+        """Store `html` and return its sha256 digest."""
+        data = html.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with gzip.open(tmp_path, "wb", compresslevel=6) as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        return digest
+
+    def get(self, digest):
+        with gzip.open(self.path(digest), "rb") as f:
+            return f.read().decode("utf-8")
+
+
+class DescriptionStore:
+    """
+    Compressed, content-addressed storage of the job descriptions.
+
+    Each description is stored once in the `descriptions` table under the sha1 of its text, which `jobs.text_hash`
+    references, however many reposts share it. Bodies are compressed with zstd and a dictionary trained on the stored
+    descriptions when the zstandard package is installed, and with zlib otherwise. The codec of every row ("zlib",
+    "zstd" or "zstd:<dictionary id>") is stored with it, so rows compressed with an older dictionary stay readable.
+    Dictionaries are never deleted: another process sharing the database may still compress with any of them, and
+    dictionaries it trained are loaded when a row needs one.
+
+    Args:
+        codec (str, optional): "zstd" or "zlib". Default is zstd when it is installed.
+        level (int, optional): Compression level. Default is 6.
+        dictionary_size (int, optional): Size in bytes of the trained zstd dictionaries. Default is 65536.
+        train_after (int, optional): Descriptions needed before a first dictionary is trained. Default is 1000.
+    """
+
+    INSERT_QUERY = "INSERT OR IGNORE INTO descriptions (text_hash, codec, body, size) VALUES (?, ?, ?, ?)"
+
+    def __init__(self, codec=None, level=6, dictionary_size=65536, train_after=1000):
+        installed = importlib.util.find_spec("zstandard") is not None
+        self.codec = codec or ("zstd" if installed else "zlib")
+        if self.codec == "zstd" and not installed:
+            logging.warning("zstandard is not installed, descriptions are compressed with zlib")
+            self.codec = "zlib"
+        self.level = level
+        self.dictionary_size = dictionary_size
+        self.train_after = train_after
+        self.dictionaries = {}
+        self.dictionary_id = None
+        self.conn = None
+        self.loaded = False
+        self.lock = threading.Lock()
+        self.local = threading.local()
+
+    @functools.cached_property
+    def zstandard(self):
+        """The zstandard module, only imported once a description needs it; None when it is not installed."""
+        try:
+            import zstandard
+        except ImportError:
+            return None
+        return zstandard
+
+    def connect(self, conn):
+        """Read the dictionaries from `conn` once a description needs them."""
+        self.conn = conn
+
+    def load(self, conn):
+        """
+        Load the trained dictionaries; the latest one compresses new descriptions. `conn` is kept to load the
+        dictionaries trained later by other processes.
+        """
+        with self.lock:
+            self.conn = conn
+            rows = conn.execute("SELECT dictionary_id, data FROM compression_dictionaries "
+                                "WHERE dictionary_id > ? ORDER BY dictionary_id",
+                                (max(self.dictionaries, default=0),)).fetchall()
+            for dictionary_id, data in rows:
+                self.dictionaries[dictionary_id] = self.zstandard.ZstdCompressionDict(data) if self.zstandard else None
+                self.dictionary_id = dictionary_id
+            self.loaded = True
+
+    def compressor(self):
+        compressors = getattr(self.local, "compressors", None)
+        if compressors is None:
+            compressors = self.local.compressors = {}
+        if self.dictionary_id not in compressors:
+            dictionary = self.dictionaries.get(self.dictionary_id)
+            compressors[self.dictionary_id] = self.zstandard.ZstdCompressor(level=self.level, dict_data=dictionary)
+        return compressors[self.dictionary_id]
+
+    def compress(self, text):
+        """
+        Returns:
+            tuple: Codec and compressed body of `text`.
+        """
+        data = text.encode("utf-8")
+        if self.codec == "zstd":
+            if not self.loaded and self.conn is not None:
+                self.load(self.conn)
+            codec = f"zstd:{self.dictionary_id}" if self.dictionary_id is not None else "zstd"
+            return codec, self.compressor().compress(data)
+        return "zlib", zlib.compress(data, self.level)
+
+    def decompress(self, codec, body):
+        if body is None:
+            return None
+        if codec == "zlib":
+            return zlib.decompress(body).decode("utf-8")
+        if self.zstandard is None:
+            raise RuntimeError(f"Description compressed with {codec} needs zstandard (pip install zstandard)")
+        dictionary_id = int(codec.split(":")[1]) if ":" in codec else None
+        if dictionary_id is not None and dictionary_id not in self.dictionaries and self.conn is not None:
+            # Trained by another process since our last load
+            self.load(self.conn)
+        dictionary = self.dictionaries[dictionary_id] if dictionary_id is not None else None
+        return self.zstandard.ZstdDecompressor(dict_data=dictionary).decompress(body).decode("utf-8")
+
+    def row(self, text_hash, text):
+        """Parameters of INSERT_QUERY for `text`."""
+        codec, body = self.compress(text)
+        return text_hash, codec, body, len(text.encode("utf-8"))
+
+    def train(self, conn, samples=2000):
+        """
+        Train a zstd dictionary on a sample of the stored descriptions, store it and use it for new descriptions.
+
+        Returns:
+            bool: False when zstd is not in use or there are not enough descriptions.
+        """
+        if self.codec != "zstd":
+            return False
+        rows = conn.execute("SELECT codec, body FROM descriptions ORDER BY random() LIMIT ?", (samples,)).fetchall()
+        if len(rows) < 100:
+            return False
+        texts = [self.decompress(codec, body).encode("utf-8") for codec, body in rows]
+        try:
+            dictionary = self.zstandard.train_dictionary(self.dictionary_size, texts)
+        except self.zstandard.ZstdError as e:
+            logging.warning(f"Could not train a description dictionary: {repr(e)}")
+            return False
+        cursor = conn.execute("INSERT INTO compression_dictionaries (data, created_at) VALUES (?, ?)",
+                              (dictionary.as_bytes(), datetime.datetime.now(pytz.utc).isoformat()))
+        self.dictionaries[cursor.lastrowid] = dictionary
+        self.dictionary_id = cursor.lastrowid
+        logging.info(f"Trained description dictionary {self.dictionary_id} on {len(texts)} descriptions")
+        return True
+
+    def recompress(self, conn, batch_size=1000):
+        """Rewrite every description not compressed with the current codec and dictionary."""
+        current = self.compress("")[0]
+        last_hash, done = "", 0
+        while True:
+            rows = conn.execute("SELECT text_hash, codec, body FROM descriptions WHERE text_hash > ? AND codec <> ? "
+                                "ORDER BY text_hash LIMIT ?", (last_hash, current, batch_size)).fetchall()
+            if not rows:
+                return done
+            last_hash = rows[-1][0]
+            conn.executemany("UPDATE descriptions SET codec = ?, body = ? WHERE text_hash = ?",
+                             [self.compress(self.decompress(codec, body)) + (text_hash,)
+                              for text_hash, codec, body in rows])
+            done += len(rows)
+
+    @staticmethod
+    def report(conn):
+        """Space used by the descriptions, compared with one raw copy per job."""
+        jobs, raw = conn.execute("SELECT COUNT(*), COALESCE(SUM(d.size), 0) FROM jobs j "
+                                 "JOIN descriptions d ON d.text_hash = j.text_hash").fetchone()
+        distinct, unique_raw, stored = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0), "
+                                                    "COALESCE(SUM(length(body)), 0) FROM descriptions").fetchone()
+        stored += conn.execute("SELECT COALESCE(SUM(length(data)), 0) FROM compression_dictionaries").fetchone()[0]
+        return {"jobs": jobs, "descriptions": distinct, "raw_bytes": raw, "deduplicated_bytes": unique_raw,
+                "stored_bytes": stored, "saved_bytes": raw - stored,
+                "ratio": round(raw / stored, 2) if stored else None}
+
+
+class NearDuplicateIndex:
+    """
+    Incremental MinHash/LSH index of the job postings, to find reposts of the same role with almost the same text.
+
+    A posting is reduced to the set of its `shingle_size`-word shingles (title and description, plus its company),
+    and summarized by a MinHash signature of `permutations` values computed with one-permutation hashing (each
+    shingle is hashed once into one of the slots; empty slots borrow the next filled one). The signature is split
+    into `bands` bands; postings sharing a band are candidates, and candidates whose signatures agree on at least
+    `threshold` of the slots (the estimated Jaccard similarity) are put in the same cluster.
+
+    The signatures, band buckets and clusters are stored in the tables of the `schema` database attached to `conn`,
+    a sidecar file that can be deleted to rebuild the index.
+
+    Args:
+        conn (sqlite3.Connection): Connection with the index database attached as `schema`.
+        schema (str, optional): Name of the attached database. Default is "lsh".
+        permutations (int, optional): Signature length. Default is 128.
+        bands (int, optional): LSH bands, must divide `permutations`. Default is 16.
+        shingle_size (int, optional): Words per shingle. Default is 5.
+        threshold (float, optional): Least estimated similarity of two near-duplicates. Default is 0.8.
+    """
+
+    WORD_PATTERN = re.compile(r"\w+")
+
+    def __init__(self, conn, schema="lsh", permutations=128, bands=16, shingle_size=5, threshold=0.8):
+        if permutations % bands:
+            raise ValueError(f"bands ({bands}) must divide permutations ({permutations})")
+        self.conn = conn
+        self.schema = schema
+        self.permutations = permutations
+        self.bands = bands
+        self.rows = permutations // bands
+        self.shingle_size = shingle_size
+        self.threshold = threshold
+
+    def create(self):
+        self.conn.execute(f"CREATE TABLE IF NOT EXISTS {self.schema}.signatures "
+                          "(Job_ID INTEGER PRIMARY KEY, text_hash TEXT, signature BLOB NOT NULL, cluster INTEGER NOT NULL)")
+        self.conn.execute(f"CREATE INDEX IF NOT EXISTS {self.schema}.idx_signatures_cluster ON signatures (cluster)")
+        self.conn.execute(f"CREATE TABLE IF NOT EXISTS {self.schema}.bands "
+                          "(band INTEGER, bucket INTEGER, Job_ID INTEGER, PRIMARY KEY (band, bucket, Job_ID)) WITHOUT ROWID")
+        self.conn.execute(f"CREATE INDEX IF NOT EXISTS {self.schema}.idx_bands_job ON bands (Job_ID)")
+        self.conn.commit()
+
+    def shingles(self, title, company, text):
+        words = self.WORD_PATTERN.findall(f"{title or ''}\n{text or ''}".lower())
+        size = min(self.shingle_size, len(words))
+        shingles = {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)} if size else set()
+        if company:
+            shingles.add(f"company:{company.strip().lower()}")
+        return shingles
+
+    def signature(self, title, company, text):
+        """MinHash signature of a posting, or None when it has no words at all."""
+        slots = [None] * self.permutations
+        for shingle in self.shingles(title, company, text):
+            value = int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "little")
+            slot, value = value % self.permutations, value >> 32
+            if slots[slot] is None or value < slots[slot]:
+                slots[slot] = value
+        if all(value is None for value in slots):
+            return None
+        # An empty slot takes the value of the next filled slot to its right (wrapping around) plus its distance to
+        # it: walking two laps right to left sees that slot before any empty slot of the second lap
+        signature = array.array("Q", [0] * self.permutations)
+        next_value, distance = None, 0
+        for position in range(2 * self.permutations - 1, -1, -1):
+            slot = position % self.permutations
+            if slots[slot] is not None:
+                next_value, distance = slots[slot], 0
+            else:
+                distance += 1
+            if position < self.permutations:
+                signature[slot] = next_value + (distance << 32)
+        return signature
+
+    def buckets(self, signature):
+        for band in range(self.bands):
+            data = signature[band * self.rows:(band + 1) * self.rows].tobytes()
+            yield band, int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "little", signed=True)
+
+    def similarity(self, first, second):
+        return sum(a == b for a, b in zip(first, second)) / self.permutations
+
+    def add(self, job_id, text_hash, signature):
+        """
+        Index the posting `job_id`, merging the clusters of the near-duplicates found on the way.
+
+        Returns:
+            int: Cluster of the posting, the smallest Job_ID of the cluster.
+        """
+        schema = self.schema
+        self.conn.execute(f"DELETE FROM {schema}.bands WHERE Job_ID = ?", (job_id,))
+        buckets = list(self.buckets(signature))
+        candidates = set()
+        for band, bucket in buckets:
+            candidates.update(row[0] for row in self.conn.execute(
+                f"SELECT Job_ID FROM {schema}.bands WHERE band = ? AND bucket = ?", (band, bucket)))
+        candidates.discard(job_id)
+
+        clusters = {job_id}
+        candidates = list(candidates)
+        for i in range(0, len(candidates), 500):
+            chunk = candidates[i:i + 500]
+            rows = self.conn.execute(f"SELECT signature, cluster FROM {schema}.signatures "
+                                     f"WHERE Job_ID IN ({', '.join('?' * len(chunk))})", chunk)
+            clusters.update(cluster for data, cluster in rows
+                            if self.similarity(signature, array.array("Q", data)) >= self.threshold)
+        cluster = min(clusters)
+        merged = sorted(clusters - {cluster, job_id})
+        if merged:
+            self.conn.execute(f"UPDATE {schema}.signatures SET cluster = ? "
+                              f"WHERE cluster IN ({', '.join('?' * len(merged))})", (cluster, *merged))
+        self.conn.execute(f"INSERT OR REPLACE INTO {schema}.signatures (Job_ID, text_hash, signature, cluster) "
+                          "VALUES (?, ?, ?, ?)", (job_id, text_hash, signature.tobytes(), cluster))
+        self.conn.executemany(f"INSERT OR IGNORE INTO {schema}.bands (band, bucket, Job_ID) VALUES (?, ?, ?)",
+                              [(band, bucket, job_id) for band, bucket in buckets])
+        return cluster
+
+    def report(self):
+        postings, clusters, duplicated = self.conn.execute(f"""
+            SELECT COALESCE(SUM(size), 0), COUNT(*), COALESCE(SUM(size > 1), 0)
+            FROM (SELECT COUNT(*) AS size FROM {self.schema}.signatures GROUP BY cluster)
+        """).fetchone()
+        return {"postings": postings, "clusters": clusters, "clusters_with_duplicates": duplicated,
+                "duplicates": postings - clusters}
+
+
+class JobExtractor:
+    """
+    Field extraction for LinkedIn search and job pages, with a single definition of the selectors for every backend.
+
+    The "selectolax" backend parses with the C-backed Lexbor parser. The "bs4" backend uses BeautifulSoup but only
+    builds the subtrees whose classes appear in the selectors (SoupStrainer). Both return the same fields as the
+    original BeautifulSoup code; `benchmarks/extraction.py` checks it on saved pages.
+
+    Args:
+        backend (str, optional): "selectolax" or "bs4". Default is selectolax when it is installed.
+    """
+
+    SELECTORS = {
+        "job_title": ".t-24.job-details-jobs-unified-top-card__job-title",
+        "company": "div.job-details-jobs-unified-top-card__company-name",
+        "tertiary_description": "div.job-details-jobs-unified-top-card__tertiary-description",
+        "insight_secondary": 'span[class="job-details-jobs-unified-top-card__job-insight-view-model-secondary"]',
+        "remote_label": "span.ui-label--accent-3",
+        "job_insight": "li.job-details-jobs-unified-top-card__job-insight",
+        "fit": "div.display-flex.flex-row.align-items-center.mt4",
+        "description": "div.jobs-box__html-content.jobs-description-content__text.t-14.t-normal"
+                       ".jobs-description-content__text--stretch",
+        "feedback_message": "span.artdeco-inline-feedback__message",
+        "search_list_item": "li.jobs-search-results__list-item",
+        "number_of_jobs": "div.jobs-search-results-list__subtitle span",
+        "no_results": ".jobs-search-no-results-banner",
+    }
+
+    # One distinctive class per selector: the "bs4" backend only builds the elements carrying one of them
+    PARTIAL_PARSE_CLASSES = {
+        "job-details-jobs-unified-top-card__job-title",
+        "job-details-jobs-unified-top-card__company-name",
+        "job-details-jobs-unified-top-card__tertiary-description",
+        "job-details-jobs-unified-top-card__job-insight-view-model-secondary",
+        "ui-label--accent-3",
+        "job-details-jobs-unified-top-card__job-insight",
+        "mt4",
+        "jobs-description-content__text",
+        "artdeco-inline-feedback__message",
+        "jobs-search-results__list-item",
+        "jobs-search-results-list__subtitle",
+        "jobs-search-no-results-banner",
+    }
+
+    def __init__(self, backend=None):
+        try:
+            from selectolax.lexbor import LexborHTMLParser
+        except ImportError:
+            LexborHTMLParser = None
+        self.html_parser = LexborHTMLParser
+        if backend is None:
+            backend = "selectolax" if LexborHTMLParser is not None else "bs4"
+        if backend == "selectolax" and LexborHTMLParser is None:
+            raise ImportError("The selectolax backend needs the selectolax package")
+        if backend not in ("selectolax", "bs4"):
+            raise ValueError(f"Unknown extractor backend: {backend}")
+        self.backend = backend
+        self.strainer = None
+        if backend == "bs4":
+            from bs4 import SoupStrainer
+            self.strainer = SoupStrainer(self.keep_tag)
+
+    @classmethod
+    def keep_tag(cls, name, attrs):
+        classes = (attrs or {}).get("class") or ""
+        if isinstance(classes, str):
+            classes = classes.split()
+        return not cls.PARTIAL_PARSE_CLASSES.isdisjoint(classes)
+
+    def parse(self, html):
+        if self.backend == "selectolax":
+            return self.html_parser(html)
+        from bs4 import BeautifulSoup
+        return BeautifulSoup(html, "html.parser", parse_only=self.strainer)
+
+    def select_first(self, root, name):
+        if self.backend == "selectolax":
+            return root.css_first(self.SELECTORS[name])
+        return root.select_one(self.SELECTORS[name])
+
+    def select_all(self, root, name):
+        if self.backend == "selectolax":
+            return root.css(self.SELECTORS[name])
+        return root.select(self.SELECTORS[name])
+
+    def text(self, node):
+        """All the text of `node`, like BeautifulSoup's `.text`."""
+        if self.backend == "selectolax":
+            return node.text(deep=True)
+        return node.text
+
+    def stripped_text(self, node, separator=""):
+        """Every stripped, non-empty string of `node` joined by `separator`, like `get_text(separator, strip=True)`."""
+        if self.backend == "selectolax":
+            pieces = node.text(deep=True, separator="\0", strip=True).split("\0")
+            return separator.join(piece for piece in pieces if piece)
+        return node.get_text(separator, strip=True)
+
+    def first_line(self, node):
+        return self.stripped_text(node, "\n").split("\n")[0] if node is not None else ''
+
+    def children(self, node):
+        """Direct children of `node`, text and comment nodes included, like BeautifulSoup's `.contents`."""
+        if self.backend == "selectolax":
+            return list(node.iter(include_text=True))
+        return node.contents
+
+    def attribute(self, node, name):
+        if self.backend == "selectolax":
+            return node.attributes.get(name)
+        return node.get(name)
+
+    def extract_job(self, html, job_id):
+        """Extract the fields of a job page (everything but language and date_post)."""
+        root = self.parse(html)
+        job = {"Job_ID": job_id}
+
+        description = self.select_first(root, "description")
+        job["Job_txt"] = self.text(description) if description is not None else None
+
+        company = self.select_first(root, "company")
+        job["company"] = self.text(company).replace("\n", "") if company is not None else None
+
+        title = self.select_first(root, "job_title")
+        job["job_title"] = self.text(title).replace("\n", "") if title is not None else None
+
+        tertiary = self.select_first(root, "tertiary_description")
+        contents = self.children(tertiary) if tertiary is not None else []
+        job["location"] = self.text(contents[1]) if len(contents) > 1 else None
+        job["posted_time_ago"] = self.text(contents[3]) if len(contents) > 3 else None
+        job["nb_candidats"] = self.text(contents[5]) if len(contents) > 5 else None
+
+        fit = self.select_first(root, "fit")
+        job["fit"] = self.text(fit).replace("\n", "").strip() if fit is not None else None
+
+        insights = self.select_all(root, "job_insight")
+        if len(insights) > 1:
+            company_size = self.stripped_text(insights[1])
+            if len(company_size.split("·")) == 2:
+                job["employes"] = company_size.split("·")[0]
+                job["sector"] = company_size.split("·")[1].strip()
+            else:
+                job["employes"] = company_size
+                job["sector"] = None
+        else:
+            job["employes"] = None
+            job["sector"] = None
+
+        elements = self.select_all(root, "insight_secondary")
+        if not elements:
+            job["type_work"] = job["time_work"] = job["level"] = ''
+        elif len(elements) <= 2:
+            job["type_work"] = self.first_line(self.select_first(root, "remote_label"))
+            job["time_work"] = self.first_line(elements[0])
+            job["level"] = self.first_line(elements[1]) if len(elements) > 1 else ''
+        else:
+            job["type_work"] = self.first_line(elements[0])
+            job["time_work"] = self.first_line(elements[1])
+            job["level"] = self.first_line(elements[2])
+        return job
+
+    # Runs the same extraction as extract_job in the page, so a rendered job costs one WebDriver round trip.
+    # arguments[0] is SELECTORS; arguments[1] asks for the page HTML too (for the archive).
+    BROWSER_SCRIPT = """
+        const selectors = arguments[0];
+        const one = name => document.querySelector(selectors[name]);
+        const all = name => Array.from(document.querySelectorAll(selectors[name]));
+        const text = node => node.nodeType === Node.COMMENT_NODE ? '' : node.textContent;
+        const strippedText = node => {
+            const pieces = [];
+            const walker = document.createTreeWalker(node, NodeFilter.SHOW_TEXT);
+            while (walker.nextNode()) {
+                const piece = walker.currentNode.data.trim();
+                if (piece) pieces.push(piece);
+            }
+            return pieces.join('');
+        };
+        const firstLine = node => node.innerText.split('\\n')[0];
+
+        const job = {};
+        const description = one('description');
+        job.Job_txt = description ? description.textContent : null;
+        const company = one('company');
+        job.company = company ? company.textContent.replace(/\\n/g, '') : null;
+        const title = one('job_title');
+        job.job_title = title ? title.textContent.replace(/\\n/g, '') : null;
+
+        const tertiary = one('tertiary_description');
+        const contents = tertiary ? Array.from(tertiary.childNodes) : [];
+        job.location = contents.length > 1 ? text(contents[1]) : null;
+        job.posted_time_ago = contents.length > 3 ? text(contents[3]) : null;
+        job.nb_candidats = contents.length > 5 ? text(contents[5]) : null;
+
+        const fit = one('fit');
+        job.fit = fit ? fit.textContent.replace(/\\n/g, '').trim() : null;
+
+        const insights = all('job_insight');
+        job.employes = null;
+        job.sector = null;
+        if (insights.length > 1) {
+            const companySize = strippedText(insights[1]);
+            const parts = companySize.split('·');
+            job.employes = parts.length === 2 ? parts[0] : companySize;
+            job.sector = parts.length === 2 ? parts[1].trim() : null;
+        }
+
+        job.type_work = job.time_work = job.level = '';
+        const elements = all('insight_secondary');
+        const remote = one('remote_label');
+        if (elements.length > 2) {
+            [job.type_work, job.time_work, job.level] = elements.slice(0, 3).map(firstLine);
+        } else if (elements.length > 0) {
+            job.type_work = remote ? firstLine(remote) : '';
+            job.time_work = firstLine(elements[0]);
+            job.level = elements.length > 1 ? firstLine(elements[1]) : '';
+        }
+
+        if (arguments[1]) job.html = document.documentElement.outerHTML;
+        return job;
+    """
+
+    def extract_rendered_job(self, driver, job_id, with_html=False):
+        """
+        Extract the fields of the job page loaded in `driver` with a single `execute_script` call.
+
+        The rendered text (`innerText`) is used for type_work, time_work and level, like the WebDriver `.text` calls it
+        replaces. With `with_html`, the page HTML is returned under "html".
+        """
+        job = driver.execute_script(self.BROWSER_SCRIPT, self.SELECTORS, with_html)
+        job["Job_ID"] = job_id
+        return job
+
+    def extract_search_page(self, html):
+        """
+        Extract a search results page.
+
+        Returns:
+            tuple: The total number of jobs of the search (0 when missing) and the Job IDs listed on the page.
+        """
+        root = self.parse(html)
+        try:
+            subtitle = self.select_first(root, "number_of_jobs")
+            number_of_jobs = int(self.text(subtitle).strip().split()[0].replace(",", ""))
+        except Exception:
+            number_of_jobs = 0
+        job_ids = [self.attribute(node, "data-occludable-job-id") for node in self.select_all(root, "search_list_item")]
+        return number_of_jobs, job_ids
+
+    def extract_liveness(self, html):
+        """
+        Returns:
+            tuple: Whether the page has the job title and the text of the inline feedback message ('' when absent).
+        """
+        root = self.parse(html)
+        message = self.select_first(root, "feedback_message")
+        has_title = self.select_first(root, "job_title") is not None
+        return has_title, self.stripped_text(message) if message is not None else ''
+
+
+class PageReadiness:
+    """
+    Waits for the conditions that make a page usable instead of sleeping for a fixed time.
+
+    Every condition has its own timeout and is polled every `poll_interval` seconds, so a page only costs the time it
+    really takes to load. "dom_settled" is signalled by a MutationObserver in the page once the DOM stops changing
+    for `quiet_ms`. The time spent on each condition and the number of timeouts are kept for report().
+
+    Args:
+        timeouts (dict, optional): Timeout in seconds per condition, overriding DEFAULT_TIMEOUTS.
+        poll_interval (float, optional): Seconds between two checks of a condition. Default is 0.1.
+        quiet_ms (int, optional): Milliseconds without DOM mutation after which the DOM is settled. Default is 250.
+        page_size (int, optional): Results of a full search page. Default is 25.
+        metrics (Metrics, optional): Receives the wait durations and timeouts of every condition.
+    """
+
+    DEFAULT_TIMEOUTS = {"document_complete": 10, "search_results": 10, "top_card": 10, "dom_settled": 3}
+
+    SEARCH_RESULTS_SCRIPT = """
+        const items = document.querySelectorAll(arguments[0]);
+        if (items.length) items[items.length - 1].scrollIntoView();
+        else window.scrollTo(0, document.body.scrollHeight);
+        return [items.length, document.querySelector(arguments[1]) !== null];
+    """
+
+    DOM_SETTLED_SCRIPT = """
+        const [quietMs, timeoutMs, done] = arguments;
+        let finished = false, quietTimer = null, limitTimer = null;
+        const observer = new MutationObserver(() => {
+            clearTimeout(quietTimer);
+            quietTimer = setTimeout(finish, quietMs, true);
+        });
+        function finish(settled) {
+            if (finished) return;
+            finished = true;
+            observer.disconnect();
+            clearTimeout(quietTimer);
+            clearTimeout(limitTimer);
+            done(settled);
+        }
+        observer.observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+        quietTimer = setTimeout(finish, quietMs, true);
+        limitTimer = setTimeout(finish, timeoutMs, false);
+    """
+
+    def __init__(self, timeouts=None, poll_interval=0.1, quiet_ms=250, page_size=25, metrics=None):
+        self.timeouts = dict(self.DEFAULT_TIMEOUTS, **(timeouts or {}))
+        self.poll_interval = poll_interval
+        self.quiet_ms = quiet_ms
+        self.page_size = page_size
+        self.metrics = metrics or Metrics()
+        self.stats = {}
+        self.lock = threading.Lock()
+
+    def record(self, name, elapsed, ready):
+        self.metrics.observe("readiness_wait_seconds", elapsed, condition=name)
+        if not ready:
+            self.metrics.inc("readiness_timeouts_total", condition=name)
+        with self.lock:
+            stats = self.stats.setdefault(name, {"count": 0, "timeouts": 0, "total": 0.0, "max": 0.0})
+            stats["count"] += 1
+            stats["timeouts"] += not ready
+            stats["total"] += elapsed
+            stats["max"] = max(stats["max"], elapsed)
+
+    def wait(self, driver, name, condition, timeout=None):
+        """
+        Poll `condition(driver)` until it is truthy or the timeout of `name` expires.
+
+        Returns:
+            bool: False on timeout.
+        """
+        from selenium.common.exceptions import TimeoutException
+        from selenium.webdriver.support.ui import WebDriverWait
+
+        start = time.perf_counter()
+        try:
+            WebDriverWait(driver, timeout or self.timeouts[name], poll_frequency=self.poll_interval).until(condition)
+            ready = True
+        except TimeoutException:
+            ready = False
+            logging.info(f"Page not ready: {name} timed out")
+        self.record(name, time.perf_counter() - start, ready)
+        return ready
+
+    def document_complete(self, driver):
+        return self.wait(driver, "document_complete",
+                         lambda d: d.execute_script("return document.readyState") == "complete")
+
+    def search_results(self, driver):
+        """
+        Scroll the result list until it holds a full page of results, until its length stops changing (the end of
+        the list), or until the search shows its "no results" banner. An empty list alone is not a result: with the
+        eager page load strategy the list is empty until the page has rendered it.
+        """
+        counts = []
+
+        def loaded(d):
+            count, no_results = d.execute_script(self.SEARCH_RESULTS_SCRIPT, JobExtractor.SELECTORS["search_list_item"],
+                                                 JobExtractor.SELECTORS["no_results"])
+            counts.append(count)
+            if count >= self.page_size or (no_results and not count):
+                return True
+            # Stable for half a second, the list has no more results to load
+            stable_checks = max(2, int(0.5 / self.poll_interval))
+            return count > 0 and len(counts) > stable_checks and len(set(counts[-stable_checks:])) == 1
+
+        return self.wait(driver, "search_results", loaded)
+
+    def top_card(self, driver):
+        """Job title and description of a job page rendered."""
+        script = "return Array.from(arguments).every(selector => document.querySelector(selector) !== null)"
+        return self.wait(driver, "top_card",
+                         lambda d: d.execute_script(script, JobExtractor.SELECTORS["job_title"],
+                                                    JobExtractor.SELECTORS["description"]))
+
+    @property
+    def script_timeout(self):
+        """Script timeout a driver needs for dom_settled, set once when the driver starts."""
+        return self.timeouts["dom_settled"] + 5
+
+    def dom_settled(self, driver):
+        """Wait until the DOM has not changed for `quiet_ms`."""
+        from selenium.common.exceptions import TimeoutException
+
+        timeout = self.timeouts["dom_settled"]
+        start = time.perf_counter()
+        try:
+            settled = bool(driver.execute_async_script(self.DOM_SETTLED_SCRIPT, self.quiet_ms, timeout * 1000))
+        except TimeoutException:
+            settled = False
+        if not settled:
+            logging.info("Page not ready: dom_settled timed out")
+        self.record("dom_settled", time.perf_counter() - start, settled)
+        return settled
+
+    def report(self):
+        """Count, timeouts and mean/max wait in seconds of every condition."""
+        with self.lock:
+            return {name: {"count": stats["count"], "timeouts": stats["timeouts"],
+                           "mean": round(stats["total"] / stats["count"], 3), "max": round(stats["max"], 3)}
+                    for name, stats in self.stats.items()}
+
+
 class ScrapLinkedin:
     """
     Class to scrap job details from LinkedIn.
@@ -55,24 +1307,238 @@ class ScrapLinkedin:
             only_remote (bool, optional): Whether to include only remote jobs. Default is True.
             more_recents (bool, optional): Whether to prioritize more recent job postings. Default is True.
         """
-        self.conn = sqlite3.connect('jobs.db')
         self.config = read_yaml()
+        database = self.config.get('database') or {}
+        self.db_path = database.get('path', 'jobs.db')
+        self.metrics = Metrics()
+        self.metrics_path = (self.config.get('metrics') or {}).get('path')
+        self.profile_path = None
+        self.chunk_size = int(database.get('chunk_size', 500))
+        self.export_path = None
+        self.reader = None
+        dedupe = self.config.get('dedupe') or {}
+        self.lsh_path = None
+        if dedupe.get('enabled', True):
+            self.lsh_path = dedupe.get('path') or f"{os.path.splitext(self.db_path)[0]}_lsh.db"
+        self.descriptions = DescriptionStore(database.get('compression'), int(database.get('compression_level', 6)),
+                                             int(database.get('dictionary_size', 65536)),
+                                             int(database.get('train_after', 1000)))
+        self.conn = self.connect_db()
+        self.writer = DbWriter(self.conn, int(database.get('batch_size', 500)), float(database.get('flush_interval', 5)),
+                               self.metrics)
+        atexit.register(self.writer.close)
+        self.duplicates = None
+        if self.lsh_path:
+            self.duplicates = NearDuplicateIndex(self.conn, "lsh", int(dedupe.get('permutations', 128)),
+                                                 int(dedupe.get('bands', 16)), int(dedupe.get('shingle_size', 5)),
+                                                 float(dedupe.get('threshold', 0.8)))
+        work_queue = self.config.get('work_queue') or {}
+        self.work_queue = WorkQueue(self.writer, float(work_queue.get('lease_seconds', 600)),
+                                    int(work_queue.get('max_attempts', 5)), float(work_queue.get('backoff_seconds', 300)),
+                                    float(work_queue.get('max_backoff_seconds', 86400)))
+        self.claim_batch = int(work_queue.get('claim_batch', 5))
+        scraping = self.config.get('scraping') or {}
+        self.base_url = scraping.get('base_url', 'https://www.linkedin.com').rstrip('/')
+        self.workers = int(scraping.get('workers', 1))
+        self.max_rate = float(scraping.get('max_requests_per_minute', 60))
+        self.min_rate = scraping.get('min_requests_per_minute')
+        self.engine = scraping.get('engine', 'selenium')
+        self.incremental = bool(scraping.get('incremental', False))
+        review = self.config.get('review') or {}
+        self.lookahead = int(review.get('lookahead', 4))
+        self.review_lean = bool(review.get('lean', False))
+        recheck = self.config.get('recheck') or {}
+        self.recheck_tiers = recheck.get('tiers') or self.RECHECK_TIERS
+        self.recheck_workers = int(recheck.get('workers', 8))
+        self.recheck_limit = int(recheck.get('max_jobs', 1000))
+        self.known_pages_to_stop = int(scraping.get('known_pages_to_stop', 1))
+        scheduler = self.config.get('scheduler') or {}
+        self.concurrent_queries = int(scheduler.get('concurrent_queries', 2))
+        self.schedule_details = bool(scheduler.get('scrap_details', True))
+        self.user_agent = scraping.get('user_agent')
+        self.browser = self.config.get('browser') or {}
+        readiness = self.config.get('readiness') or {}
+        self.readiness = PageReadiness(readiness.get('timeouts'), float(readiness.get('poll_interval', 0.1)),
+                                       int(readiness.get('quiet_ms', 250)), metrics=self.metrics)
+        self.parser = scraping.get('parser')
+        self.job_extractor = None
+        language = self.config.get('language') or {}
+        self.languages = language.get('languages')
+        self.language_processes = language.get('processes')
+        filters = self.config.get('filters') or {}
+        self.job_filter = JobFilter(filters.get('exclude_title', self.EXCLUDE_TITLE),
+                                    filters.get('exclude_description', self.EXCLUDE_DESCRIPTION))
+        archive = self.config.get('archive') or {}
+        self.archive = HtmlArchive(archive.get('path', 'archive')) if archive.get('enabled') else None
+        self.command = None
         self.check_db()
-        self.driver = self.connect_selenium()
+        self.drivers = []
+        self.profile_locks = []
+        self.http_fetcher = None
+        # Worker threads start the shared browser and HTTP session lazily; reentrant, as `http` may start the browser
+        self.session_lock = threading.RLock()
+        self.fallback_lock = threading.Lock()
+        self.seen_ids = set()
+        self.new_ids = set()
+        self.seen_lock = threading.Lock()
         self.keywords = keywords
         self.location = location
         self.only_remote = only_remote
         self.more_recents = more_recents
+        self.rate_limiter = RateLimiter(self.max_rate, self.min_rate)
+
+    @property
+    def driver(self):
+        """Main WebDriver session, only started when a page really needs Chrome."""
+        if not self.drivers:
+            self.ensure_drivers(1)
+        return self.drivers[0]
+
+    @property
+    def extractor(self):
+        """JobExtractor of the scraping.parser backend, only built (and its parser imported) when a page is parsed."""
+        if self.job_extractor is None:
+            self.job_extractor = JobExtractor(self.parser)
+        return self.job_extractor
+
+    @property
+    def http(self):
+        """Shared HttpFetcher, seeded from cookies.json (logging in with Selenium first if there are no cookies yet)."""
+        if self.http_fetcher is None:
+            with self.session_lock:
+                if self.http_fetcher is None:
+                    if not os.path.exists("cookies.json"):
+                        # Log in with a browser to save the cookies
+                        self.ensure_drivers(1)
+                    self.http_fetcher = HttpFetcher(pool_size=max(self.workers, 10), user_agent=self.user_agent)
+        return self.http_fetcher
+
+    def http_get(self, url, retries=3):
+        """
+        Fetch a page through the HTTP engine, backing off and retrying while LinkedIn throttles.
+
+        Returns:
+            str: The page HTML, or None when the request failed.
+        """
+        status, html = self.http_fetch(url, retries)
+        return html if status is not None and status < 400 else None
+
+    def http_fetch(self, url, retries=3):
+        """
+        Like http_get, but also return the status code.
+
+        Returns:
+            tuple: Status code and HTML, or (None, None) when the request failed or stayed throttled.
+        """
+        import requests
+
+        for attempt in range(retries + 1):
+            self.rate_limiter.acquire()
+            start = time.perf_counter()
+            try:
+                status, html = self.http.get(url)
+            except requests.RequestException as e:
+                self.metrics.inc("fetch_errors_total", engine="http")
+                logging.error(f"Error to fetch {url}: {repr(e)}")
+                return None, None
+            self.metrics.observe("page_load_seconds", time.perf_counter() - start, engine="http")
+            self.metrics.inc("pages_fetched_total", engine="http")
+            # The status alone: a job description may well mention "429 Too Many Requests"
+            if status == 429:
+                logging.error("Got Too Many requests")
+                self.metrics.inc("throttle_events_total", engine="http")
+                self.rate_limiter.throttled()
+                continue
+            self.rate_limiter.success()
+            if status >= 400:
+                logging.error(f"HTTP {status} for {url}")
+            return status, html
+        return None, None
+
+    # Whether the page loaded is LinkedIn's throttle page. Chrome exposes the HTTP status of the navigation; without
+    # it, the throttle page is recognized by its structure (a short body with neither a job nor a result list),
+    # not by its phrase, which any job description may contain. Only a boolean crosses the WebDriver connection.
+    # arguments[0] is the selector of the elements of a real page.
+    THROTTLED_SCRIPT = """
+        const [navigation] = performance.getEntriesByType('navigation');
+        if (navigation && navigation.responseStatus) return navigation.responseStatus === 429;
+        const body = document.body;
+        return body !== null && body.textContent.length < 2000 && document.querySelector(arguments[0]) === null
+            && body.textContent.includes('Too Many Requests');
+    """
+
+    PAGE_CONTENT_SELECTOR = ", ".join(JobExtractor.SELECTORS[name] for name in ["job_title", "search_list_item"])
+
+    def browser_get(self, driver, url, retries=3):
+        """
+        Load `url` in `driver` through the rate limiter, backing off and retrying while LinkedIn throttles.
+
+        Returns:
+            bool: False when the page was still throttled after every retry.
+        """
+        for attempt in range(retries + 1):
+            self.rate_limiter.acquire()
+            with self.metrics.timer("page_load_seconds", engine="browser"):
+                driver.get(url)
+            self.metrics.inc("pages_fetched_total", engine="browser")
+            if not driver.execute_script(self.THROTTLED_SCRIPT, self.PAGE_CONTENT_SELECTOR):
+                self.rate_limiter.success()
+                return True
+            logging.error("Got Too Many requests")
+            self.metrics.inc("throttle_events_total", engine="browser")
+            self.rate_limiter.throttled()
+        return False
+
+    def connect_db(self):
+        """
+        Open the jobs database in WAL mode, so readers (navigate_jobs, exports) are not blocked by a running crawl,
+        with pragmas tuned for batched writes, and attach the near-duplicate index as `lsh`.
+        """
+        conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-65536")
+        conn.execute("PRAGMA mmap_size=268435456")
+        conn.execute("PRAGMA busy_timeout=30000")
+        if self.lsh_path:
+            conn.execute("ATTACH DATABASE ? AS lsh", (self.lsh_path,))
+            conn.execute("PRAGMA lsh.journal_mode=WAL")
+        conn.create_function("job_rejected", 2, lambda title, description: self.job_filter.rejects(title, description),
+                             deterministic=True)
+        conn.create_function("description", 2, self.descriptions.decompress, deterministic=True)
+        return conn
+
+    @property
+    def read_conn(self):
+        """
+        Read-only connection for streaming queries. In WAL mode its reads neither block nor wait for the writer, so
+        a long iteration can run while rows are written through `conn`.
+        """
+        if self.reader is None:
+            self.reader = sqlite3.connect(f"file:{quote(os.path.abspath(self.db_path))}?mode=ro", uri=True,
+                                          timeout=30, check_same_thread=False)
+            self.reader.row_factory = sqlite3.Row
+            self.reader.create_function("description", 2, self.descriptions.decompress, deterministic=True)
+            self.reader.execute("PRAGMA cache_size=-16384")
+            self.reader.execute("PRAGMA mmap_size=268435456")
+        return self.reader
+
+    # UPDATE ... RETURNING, used by WorkQueue.claim (UPDATE ... FROM, used by dedupe_jobs, needs 3.33)
+    MIN_SQLITE_VERSION = (3, 35, 0)
 
     def check_db(self):
         logging.info("Checking db...")
+        if sqlite3.sqlite_version_info < self.MIN_SQLITE_VERSION:
+            raise RuntimeError(f"SQLite {'.'.join(map(str, self.MIN_SQLITE_VERSION))} or newer is required, "
+                               f"Python is linked with SQLite {sqlite3.sqlite_version}")
         cursor = self.conn.cursor()
         cursor.execute('''
             CREATE TABLE if not exists jobs (
             Job_ID INTEGER PRIMARY KEY,
             type_work TEXT,
             time_work TEXT,
-            Job_txt TEXT,
+            Job_txt TEXT,  -- always NULL since schema version 4, see the descriptions table
             company TEXT,
             job_title TEXT,
             level TEXT,
@@ -88,21 +1554,294 @@ class ScrapLinkedin:
             applied INTEGER
         )
         ''')
+        cursor.execute('''
+            CREATE TABLE if not exists page_archive (
+            Job_ID INTEGER,
+            fetched_at TEXT,
+            sha256 TEXT,
+            PRIMARY KEY (Job_ID, fetched_at)
+        )
+        ''')
 
         self.conn.commit()
+        self.migrate()
+        self.descriptions.connect(self.conn)
+        if self.duplicates is not None:
+            self.duplicates.create()
+        for name, plan in self.check_query_plans().items():
+            logging.warning(f"Query {name} is not fully indexed: {plan}")
+
+    # Rows whose language must be (re)detected: new descriptions, or descriptions changed since the last detection
+    # near-duplicates are skipped, they never reach the review queue. Changing it needs a migration rebuilding
+    # idx_jobs_language_pending with the new predicate (check_query_plans warns until then)
+    LANGUAGE_PENDING = ("text_hash IS NOT NULL AND duplicate_of IS NULL "
+                        "AND (language IS NULL OR language_hash IS NOT text_hash)")
+
+    # Schema changes applied in order on top of the tables created by check_db. PRAGMA user_version holds the number
+    # of the last one applied. A step is an SQL statement or a function taking the connection; a "VACUUM" step runs
+    # once the transaction of its migration is committed. Steps are frozen: they never use constants or helpers that
+    # later versions may change, so an old database always runs the same migration.
+    MIGRATIONS = [
+        (1, "details pending state and indexes for list_ids_details and fetch_jobs", [
+            "ALTER TABLE jobs ADD COLUMN details_pending INTEGER NOT NULL DEFAULT 1",
+            "UPDATE jobs SET details_pending = 0 WHERE company IS NOT NULL AND company <> ''",
+            "CREATE INDEX IF NOT EXISTS idx_jobs_details_pending ON jobs (Job_ID) WHERE details_pending = 1",
+            "CREATE INDEX IF NOT EXISTS idx_jobs_review ON jobs (date_post, language, type_work, level, time_work) "
+            "WHERE applied IS NULL",
+        ]),
+        (2, "description hashes and language cache for incremental language detection", [
+            "ALTER TABLE jobs ADD COLUMN text_hash TEXT",
+            "ALTER TABLE jobs ADD COLUMN language_hash TEXT",
+            "CREATE TABLE IF NOT EXISTS language_cache (text_hash TEXT PRIMARY KEY, language TEXT, confidence REAL)",
+            "CREATE INDEX IF NOT EXISTS idx_jobs_language_pending ON jobs (Job_ID) WHERE Job_txt IS NOT NULL "
+            "AND (language IS NULL OR text_hash IS NULL OR language_hash IS NOT text_hash)",
+        ]),
+        (3, "checkpoints of incremental crawls", [
+            "CREATE TABLE IF NOT EXISTS crawl_checkpoints "
+            "(query_key TEXT PRIMARY KEY, last_seen_id INTEGER, last_seen_at TEXT, pages INTEGER)",
+        ]),
+        (4, "compressed, deduplicated descriptions", [
+            "CREATE TABLE IF NOT EXISTS descriptions "
+            "(text_hash TEXT PRIMARY KEY, codec TEXT NOT NULL, body BLOB NOT NULL, size INTEGER NOT NULL)",
+            "CREATE TABLE IF NOT EXISTS compression_dictionaries "
+            "(dictionary_id INTEGER PRIMARY KEY, data BLOB NOT NULL, created_at TEXT)",
+            lambda conn: ScrapLinkedin.move_descriptions_v4(conn),
+            "DROP INDEX IF EXISTS idx_jobs_language_pending",
+            "CREATE INDEX idx_jobs_language_pending ON jobs (Job_ID) WHERE text_hash IS NOT NULL "
+            "AND (language IS NULL OR language_hash IS NOT text_hash)",
+            "VACUUM",
+        ]),
+        (5, "closed status and liveness check time", [
+            "ALTER TABLE jobs ADD COLUMN closed INTEGER",
+            "ALTER TABLE jobs ADD COLUMN checked_at TEXT",
+            "DROP INDEX IF EXISTS idx_jobs_review",
+            "CREATE INDEX idx_jobs_review ON jobs (date_post, language, type_work, level, time_work) "
+            "WHERE applied IS NULL AND closed IS NULL",
+        ]),
+        (6, "durable work queue of the job details", [
+            "CREATE TABLE IF NOT EXISTS work_queue (Job_ID INTEGER PRIMARY KEY, state TEXT NOT NULL DEFAULT 'pending', "
+            "priority INTEGER NOT NULL DEFAULT 0, attempts INTEGER NOT NULL DEFAULT 0, "
+            "available_at REAL NOT NULL DEFAULT 0, lease_owner TEXT, last_error TEXT, updated_at TEXT)",
+            "CREATE INDEX IF NOT EXISTS idx_work_queue_ready ON work_queue (priority DESC, Job_ID DESC) "
+            "WHERE state IN ('pending', 'leased')",
+        ]),
+        (7, "near-duplicate postings", [
+            "ALTER TABLE jobs ADD COLUMN duplicate_of INTEGER",
+            "DROP INDEX IF EXISTS idx_jobs_review",
+            "CREATE INDEX idx_jobs_review ON jobs (date_post, language, type_work, level, time_work) "
+            "WHERE applied IS NULL AND closed IS NULL AND duplicate_of IS NULL",
+            "DROP INDEX IF EXISTS idx_jobs_language_pending",
+            "CREATE INDEX idx_jobs_language_pending ON jobs (Job_ID) WHERE text_hash IS NOT NULL "
+            "AND duplicate_of IS NULL AND (language IS NULL OR language_hash IS NOT text_hash)",
+        ]),
+        (8, "review queue ordered by a unique key for keyset pagination", [
+            "DROP INDEX IF EXISTS idx_jobs_review",
+            "CREATE INDEX idx_jobs_review ON jobs (IFNULL(date_post, ''), Job_ID, language, type_work, level, "
+            "time_work) WHERE applied IS NULL AND closed IS NULL AND duplicate_of IS NULL",
+        ]),
+    ]
+
+    def migrate(self):
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        for number, description, steps in self.MIGRATIONS:
+            if number <= version:
+                continue
+            logging.info(f"Migrating db to version {number}: {description}")
+            try:
+                self.conn.execute("BEGIN")
+                for step in steps:
+                    if callable(step):
+                        step(self.conn)
+                    elif step != "VACUUM":
+                        self.conn.execute(step)
+                self.conn.execute(f"PRAGMA user_version = {number}")
+                self.conn.commit()
+            except Exception:
+                self.conn.rollback()
+                raise
+            if "VACUUM" in steps:
+                self.conn.execute("VACUUM")
+                self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    @staticmethod
+    def move_descriptions_v4(conn, batch_size=1000):
+        """
+        Move the descriptions stored in jobs.Job_txt to the descriptions table (migration 4). They are compressed
+        with zlib, the codec every version reads; compact_descriptions recompresses them with a dictionary later.
+        """
+        last_id, moved = -1, 0
+        while True:
+            rows = conn.execute("SELECT Job_ID, Job_txt FROM jobs WHERE Job_txt IS NOT NULL AND Job_ID > ? "
+                                "ORDER BY Job_ID LIMIT ?", (last_id, batch_size)).fetchall()
+            if not rows:
+                break
+            last_id = rows[-1][0]
+            hashes = [hashlib.sha1(text.encode("utf-8")).hexdigest() for job_id, text in rows]
+            conn.executemany("INSERT OR IGNORE INTO descriptions (text_hash, codec, body, size) VALUES (?, 'zlib', ?, ?)",
+                             [(digest, zlib.compress(text.encode("utf-8"), 6), len(text.encode("utf-8")))
+                              for (job_id, text), digest in zip(rows, hashes)])
+            conn.executemany("UPDATE jobs SET text_hash = ?, Job_txt = NULL WHERE Job_ID = ?",
+                             [(digest, job_id) for (job_id, text), digest in zip(rows, hashes)])
+            moved += len(rows)
+        logging.info(f"Moved {moved} descriptions")
+
+    def compact_descriptions(self, force=False):
+        """
+        Train a description dictionary once enough descriptions are stored (or always with `force`), recompress the
+        descriptions with it and log the space used.
+        """
+        with self.writer.lock:
+            self.writer.flush()
+            self.descriptions.load(self.conn)
+            if force or (self.descriptions.dictionary_id is None and self.conn.execute(
+                    "SELECT COUNT(*) FROM descriptions").fetchone()[0] >= self.descriptions.train_after):
+                if self.descriptions.train(self.conn):
+                    recompressed = self.descriptions.recompress(self.conn)
+                    logging.info(f"Recompressed {recompressed} descriptions")
+                self.conn.commit()
+            report = DescriptionStore.report(self.conn)
+        logging.info(f"Descriptions: {report}")
+        return report
+
+    def hot_queries(self):
+        """Name, SQL and parameters of the queries that must stay indexed."""
+        return {
+            "list_ids_details": (self.LIST_IDS_DETAILS_QUERY, ()),
+            "claim_details": (WorkQueue.READY_QUERY, (0, 1)),
+            "fetch_jobs": (self.page_query(self.FETCH_JOBS_QUERY, self.REVIEW_KEYSET[0]),
+                           (self.base_url, "", "", 0, 1)),
+            "detect_languages": (self.LANGUAGE_PENDING_QUERY, (0, 1)),
+            "recheck": (self.page_query(self.recheck_query(), self.REVIEW_KEYSET[0]), (1, "", "", 0, 1)),
+        }
+
+    def check_query_plans(self):
+        """
+        Run EXPLAIN QUERY PLAN on the hot queries.
+
+        Returns:
+            dict: Plan of every query that scans a table without an index or sorts in a temporary b-tree.
+        """
+        problems = {}
+        for name, (sql, params) in self.hot_queries().items():
+            plan = [row[3] for row in self.conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+            if any((step.startswith("SCAN") and "USING" not in step) or "TEMP B-TREE" in step for step in plan):
+                problems[name] = plan
+        return problems
+
+    def chrome_options(self, profile_dir=None, headless=None, lean=None):
+        """
+        Chrome options of a browser using the persistent profile `profile_dir`, from the browser section of config.yml.
+
+        The lean profile disables images and background features and returns from driver.get() once the DOM is
+        ready (eager page load strategy). `headless` and `lean` override browser.headless and browser.lean.
+        """
+        from selenium import webdriver
+
+        options = webdriver.ChromeOptions()
+        if self.browser.get('headless') if headless is None else headless:
+            options.add_argument("--headless=new")
+            options.add_argument("--window-size=1366,900")
+        else:
+            options.add_argument("--start-maximized")
+        if self.browser.get('lean', False) if lean is None else lean:
+            options.page_load_strategy = self.browser.get('page_load_strategy', 'eager')
+            options.add_argument("--blink-settings=imagesEnabled=false")
+            for argument in ["--disable-extensions", "--mute-audio", "--no-first-run", "--disable-sync",
+                             "--disable-background-networking", "--disable-default-apps", "--disable-notifications"]:
+                options.add_argument(argument)
+            options.add_experimental_option("prefs", {
+                "profile.managed_default_content_settings.images": 2,
+                "profile.default_content_setting_values.notifications": 2,
+                "profile.default_content_setting_values.geolocation": 2,
+            })
+        if profile_dir:
+            options.add_argument(f"--user-data-dir={os.path.abspath(profile_dir)}")
+        return options
+
+    def claim_profile(self):
+        """
+        Claim a persistent browser profile, as two Chrome instances cannot share one: `<user_data_dir>/worker-<N>`
+        for the lowest N whose lock file no other browser holds, in this process or another (a review running
+        during a crawl, a second details process...). The lock is released by close(), or when the process dies.
+
+        Returns:
+            str: Profile directory, or None without browser.user_data_dir.
+        """
+        user_data_dir = self.browser.get('user_data_dir')
+        if not user_data_dir:
+            return None
+        try:
+            import fcntl
+
+            def lock(f):
+                fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except ImportError:
+            import msvcrt
+
+            def lock(f):
+                msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+        os.makedirs(user_data_dir, exist_ok=True)
+        for slot in itertools.count():
+            f = open(os.path.join(user_data_dir, f"worker-{slot}.lock"), "a")
+            try:
+                lock(f)
+            except OSError:
+                f.close()
+                continue
+            self.profile_locks.append(f)
+            return os.path.join(user_data_dir, f"worker-{slot}")
+
+    def block_resources(self, driver, lean=None):
+        """Block the URL patterns of browser.blocked_urls (fonts, media, trackers) through the DevTools protocol."""
+        patterns = self.browser.get('blocked_urls') or []
+        if (self.browser.get('lean', False) if lean is None else lean) and patterns:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+
+    def browser_report(self):
+        """Number and mean/max duration in seconds of the browser startups and page loads."""
+        return {"startup": self.metrics.summary("browser_startup_seconds"),
+                "page_load": self.metrics.summary("page_load_seconds", engine="browser")}
+
+    def connect_selenium(self, index=0, headless=None, lean=None):
+        """
+        Start browser `index` and authenticate it. `headless` and `lean` override the browser section of config.yml.
+
+        A persistent profile that was already used is logged in by itself; otherwise cookies.json is replayed, and
+        as a last resort the credentials of config.yml are typed in the login page.
+        """
+        from selenium import webdriver
+        from selenium.webdriver.chrome.service import Service
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.common.keys import Keys
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.webdriver.support.ui import WebDriverWait
 
-    def connect_selenium(self):
         logging.info("Connect selenium")
         service = Service()
 
         # 2. Instanciate the webdriver
-        options = webdriver.ChromeOptions()
-        options.add_argument("--start-maximized")
-        driver = webdriver.Chrome(options=options, service=service)
+        profile_dir = self.claim_profile()
+        logged_profile = profile_dir is not None and os.path.isdir(profile_dir) and bool(os.listdir(profile_dir))
+        start = time.perf_counter()
+        driver = webdriver.Chrome(options=self.chrome_options(profile_dir, headless, lean), service=service)
+        self.block_resources(driver, lean)
+        driver.set_script_timeout(self.readiness.script_timeout)
+        startup = time.perf_counter() - start
+        self.metrics.observe("browser_startup_seconds", startup)
+        logging.info(f"Browser {index} started in {startup:.2f}s")
 
         cookies_file = "cookies.json"
+        if logged_profile:
+            driver.get(self.base_url)
+            if "/login" not in driver.current_url and "/authwall" not in driver.current_url:
+                with open(cookies_file, "w") as f:
+                    json.dump(driver.get_cookies(), f)
+                return driver
+            logging.info(f"Profile {profile_dir} is logged out")
+
         if os.path.exists(cookies_file):
-            driver.get("https://www.linkedin.com")
+            driver.get(self.base_url)
             with open(cookies_file, "r") as f:
                 cookies = json.load(f)
                 current_domain = urlparse(driver.current_url).netloc
@@ -110,14 +1849,14 @@ class ScrapLinkedin:
                     cookie['domain'] = cookie['domain'].lstrip(".")
                     if current_domain in cookie.get("domain", ""):
                         driver.add_cookie(cookie)
-            driver.get("https://www.linkedin.com")
+            driver.get(self.base_url)
             with open(cookies_file, "w") as f:
                 json.dump(driver.get_cookies(), f)
             return driver
 
         # 3. Open the LinkedIn login page
-        driver.get("https://www.linkedin.com/login")
-        time.sleep(5)  # waiting for the page to load
+        driver.get(f"{self.base_url}/login")
+        WebDriverWait(driver, 30).until(EC.presence_of_element_located((By.ID, "username")))
 
         # 4. Enter our email@ & pwd
         email_input = driver.find_element(By.ID, "username")
@@ -134,18 +1873,16 @@ class ScrapLinkedin:
 
         return driver
 
-    def scroll_to_bottom(self, sleep_time=10):
-        last_height = self.driver.execute_script("return document.body.scrollHeight")
-        while True:
-            self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            new_height = self.driver.execute_script("return document.body.scrollHeight")
-            if new_height == last_height:
-                break
-            last_height = new_height
-
-        time.sleep(int(sleep_time))
+    def ensure_drivers(self, count):
+        """Open extra WebDriver sessions until `count` are available; they reuse the cookies saved by the first one."""
+        with self.session_lock:
+            while len(self.drivers) < count:
+                logging.info(f"Starting worker browser {len(self.drivers) + 1}/{count}")
+                self.drivers.append(self.connect_selenium(len(self.drivers)))
+            return self.drivers[:count]
 
-    def parse_relative_time(self, relative_time):
+    @staticmethod
+    def parse_relative_time(relative_time):
         now = datetime.datetime.now(pytz.utc)
         relative_time = relative_time.replace("Reposted", "").strip()
 
@@ -171,47 +1908,82 @@ class ScrapLinkedin:
 
         return None
 
-    def find_job_ids(self, soup):
-        """Parse the HTML content of the page (using BeautifulSoup) and find Job Ids"""
-        Job_Ids_on_the_page = []
+    def find_job_ids(self, html):
+        """Parse the HTML content of the page and find Job Ids"""
+        number_of_jobs, Job_Ids_on_the_page = self.extractor.extract_search_page(html)
+        return Job_Ids_on_the_page
 
-        job_postings = soup.find_all("li", {"class": "jobs-search-results__list-item"})
-        for job_posting in job_postings:
-            Job_ID = job_posting.get("data-occludable-job-id")
-            Job_Ids_on_the_page.append(Job_ID)
+    def search_query(self, query=None):
+        """
+        Complete `query`, an entry of the queries section of config.yml, with the search parameters of this object.
 
-        return Job_Ids_on_the_page
+        Returns:
+            dict: keywords, location, only_remote and more_recents.
+        """
+        query = query or {}
+        return dict(keywords=query.get('keywords', self.keywords), location=query.get('location', self.location),
+                    only_remote=query.get('only_remote', self.only_remote),
+                    more_recents=query.get('more_recents', self.more_recents))
 
-    def request_job_codes(self, page):
-        url = f"https://www.linkedin.com/jobs/search/?keywords={self.keywords}&location={self.location}&start={page}&sortBy=DD{'&f_WT=2' if self.only_remote else ''}{'&f_TPR=r604800' if self.more_recents else ''}"
-        url = requests.utils.requote_uri(url)
-        self.driver.get(url)
-        self.scroll_to_bottom()
+    def request_job_codes(self, page, posted_within=None, query=None, driver=None):
+        """
+        Load a search results page and return its HTML, using Selenium only when the HTTP engine gets no result list.
+
+        Args:
+            page (int): Offset of the first result.
+            posted_within (int, optional): Only list jobs posted in the last `posted_within` seconds. Default is one
+                week when `more_recents` is set.
+            query (dict, optional): Search parameters, see search_query(). Default is the search of this object.
+            driver (WebDriver, optional): Browser to use; the shared main driver when None.
+        """
+        from requests.utils import requote_uri
+
+        query = self.search_query(query)
+        if posted_within is None and query['more_recents']:
+            posted_within = 604800
+        url = f"{self.base_url}/jobs/search/?keywords={query['keywords']}&location={query['location']}&start={page}&sortBy=DD{'&f_WT=2' if query['only_remote'] else ''}{f'&f_TPR=r{posted_within}' if posted_within else ''}"
+        url = requote_uri(url)
+        if self.engine == 'http':
+            html = self.http_get(url)
+            if html and "jobs-search-results__list-item" in html:
+                return html
+            logging.info("Search page has no result list over HTTP, falling back to Selenium")
+        if driver is None:
+            with self.fallback_lock:
+                return self.load_search_page(self.driver, url)
+        return self.load_search_page(driver, url)
+
+    def load_search_page(self, driver, url):
+        self.browser_get(driver, url)
+        self.readiness.search_results(driver)
+        return driver.page_source
 
     def insert_job_ids(self, job_ids):
-        cursor = self.conn.cursor()
+        """Queue the IDs for insertion, skipping those already found by this run, e.g. by an overlapping query."""
+        with self.seen_lock:
+            job_ids = [job_id for job_id in dict.fromkeys(self.numeric_ids(job_ids)) if job_id not in self.seen_ids]
+            self.seen_ids.update(job_ids)
         insert_query = '''
                     INSERT OR IGNORE INTO jobs (Job_ID) VALUES (?)
                     '''
-        for job_id in job_ids:
-            cursor.execute(insert_query, (job_id,))
-
-        self.conn.commit()
+        self.writer.add_many(insert_query, [(job_id,) for job_id in job_ids])
+        return len(job_ids)
 
     def insert_job_details(self, job_data):
-        cursor = self.conn.cursor()
         job_data['scraping_date'] = datetime.datetime.now().date()  # Convert datetime to date
 
         try:
-            cursor.execute('''
-                INSERT OR REPLACE INTO jobs (Job_ID, type_work, time_work, level, Job_txt, language, company, job_title, location, posted_time_ago, date_post, nb_candidats, fit, employes, sector, scraping_date)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            if job_data['Job_txt'] is not None:
+                self.writer.add(DescriptionStore.INSERT_QUERY,
+                                self.descriptions.row(job_data['text_hash'], job_data['Job_txt']))
+            self.writer.add('''
+                INSERT OR REPLACE INTO jobs (Job_ID, type_work, time_work, level, language, company, job_title, location, posted_time_ago, date_post, nb_candidats, fit, employes, sector, scraping_date, details_pending, text_hash)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             ''', (
                 job_data['Job_ID'],
                 job_data['type_work'],
                 job_data['time_work'],
                 job_data['level'],
-                job_data['Job_txt'],
                 job_data['language'],
                 job_data['company'],
                 job_data['job_title'],
@@ -222,374 +1994,1238 @@ class ScrapLinkedin:
                 job_data['fit'],
                 job_data['employes'],
                 job_data['sector'],
-                job_data['scraping_date']
+                job_data['scraping_date'],
+                0 if job_data['company'] else 1,
+                job_data['text_hash']
             ))
+            if job_data.get('archive_sha256'):
+                self.writer.add('''
+                    INSERT OR IGNORE INTO page_archive (Job_ID, fetched_at, sha256) VALUES (?, ?, ?)
+                ''', (job_data['Job_ID'], job_data['fetched_at'], job_data['archive_sha256']))
 
         except Exception as e:
             logging.error(repr(e))
-        finally:
-            self.conn.commit()
 
-    def list_ids_details(self):
-        select_query = '''
+    LIST_IDS_DETAILS_QUERY = '''
             SELECT Job_ID
             FROM jobs
-            WHERE company IS NULL OR company = ''
+            WHERE details_pending = 1
             '''
 
-        # Executar a consulta
-        cursor = self.conn.cursor()
-        cursor.execute(select_query)
-
-        results = cursor.fetchall()
+    def list_ids_details(self):
+        """
+        Queue the jobs still missing their details in the work queue.
 
-        ids = [row[0] for row in results]
-        return ids
+        Returns:
+            dict: Number of queue items in every state, and of items ready now.
+        """
+        queued = self.work_queue.enqueue(self.LIST_IDS_DETAILS_QUERY)
+        report = self.work_queue.report()
+        logging.info(f"Queued {queued} job(s) for details, work queue: {report}")
+        return report
 
     def update_posted_time_ago(self):
-        cursor = self.conn.cursor()
+        self.detect_languages()
 
-        cursor.execute('''
-            SELECT Job_ID, Job_txt FROM jobs WHERE Job_txt IS NOT NULL
-        ''')
-
-        rows = cursor.fetchall()
+    LANGUAGE_PENDING_QUERY = f'''
+            SELECT Job_ID, text_hash FROM jobs
+            WHERE {LANGUAGE_PENDING} AND Job_ID > ?
+            ORDER BY Job_ID LIMIT ?
+        '''
 
-        for row in rows:
-            job_id, posted_time_ago = row
-            logging.info(f"Processing job id {job_id}")
-            parsed_time, confidence = self.detect_language(posted_time_ago)
-            formatted_time = parsed_time
+    @stage("detect_languages")
+    def detect_languages(self, processes=None, batch_size=1000):
+        """
+        Detect the language of every description that is new or changed since its last detection.
 
-            cursor.execute('''
-                        UPDATE jobs
-                        SET language = ?
-                        WHERE Job_ID = ?
-                    ''', (formatted_time, job_id))
+        Results are cached by description hash in `language_cache`, so reposted descriptions are free. The other
+        descriptions are classified on a process pool, with langid restricted to the configured languages, and each
+        batch is written back with one executemany.
 
-        self.conn.commit()
+        Args:
+            processes (int, optional): Number of classifier processes. Default is the `language.processes` setting,
+                or the number of CPUs.
+            batch_size (int, optional): Rows read and written per batch. Default is 1000.
+        """
+        processes = processes or self.language_processes
+        self.set_languages(self.languages)
+        executor = None
+        last_id, done, classified = -1, 0, 0
+        try:
+            while True:
+                self.writer.flush()
+                rows = self.conn.execute(self.LANGUAGE_PENDING_QUERY, (last_id, batch_size)).fetchall()
+                if not rows:
+                    break
+                last_id = rows[-1][0]
+                languages = self.cached_languages({text_hash for job_id, text_hash in rows})
+
+                missing = self.description_texts({text_hash for job_id, text_hash in rows} - set(languages))
+                if missing:
+                    if executor is None and processes != 1 and len(missing) >= 100:
+                        executor = ProcessPoolExecutor(max_workers=processes, initializer=self.set_languages,
+                                                       initargs=(self.languages,))
+                    with self.metrics.timer("language_batch_seconds"):
+                        results = self.classify_texts(list(missing.values()), executor)
+                    self.metrics.inc("languages_classified_total", len(missing))
+                    self.writer.add_many('''
+                        INSERT OR REPLACE INTO language_cache (text_hash, language, confidence) VALUES (?, ?, ?)
+                    ''', [(digest, language, confidence) for digest, (language, confidence) in zip(missing, results)])
+                    languages.update((digest, language) for digest, (language, confidence) in zip(missing, results))
+                    classified += len(missing)
+
+                self.writer.add_many('''
+                    UPDATE jobs SET language = ?, language_hash = ? WHERE Job_ID = ?
+                ''', [(languages.get(text_hash), text_hash, job_id) for job_id, text_hash in rows])
+                done += len(rows)
+                self.metrics.inc("languages_cached_total", len(rows) - len(missing))
+                logging.info(f"Language detected for {done} jobs ({classified} classified, the rest cached)")
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        self.writer.flush()
+
+    # Jobs with a description that is not indexed yet, or changed since it was indexed
+    DEDUPE_PENDING_QUERY = '''
+            SELECT j.Job_ID, j.job_title, j.company, j.text_hash FROM jobs j
+            LEFT JOIN lsh.signatures s ON s.Job_ID = j.Job_ID
+            WHERE j.text_hash IS NOT NULL AND s.text_hash IS NOT j.text_hash AND j.Job_ID > ?
+            ORDER BY j.Job_ID LIMIT ?
+        '''
+
+    # The representative of a cluster is its oldest job that is not closed; the others point to it
+    MARK_DUPLICATES_QUERY = '''
+            UPDATE jobs SET duplicate_of = m.representative
+            FROM (SELECT s.Job_ID, NULLIF(FIRST_VALUE(s.Job_ID) OVER (
+                      PARTITION BY s.cluster ORDER BY j.closed IS NOT NULL, s.Job_ID), s.Job_ID) AS representative
+                  FROM lsh.signatures s JOIN jobs j ON j.Job_ID = s.Job_ID) AS m
+            WHERE jobs.Job_ID = m.Job_ID AND jobs.duplicate_of IS NOT m.representative
+        '''
+
+    @stage("dedupe_jobs")
+    def dedupe_jobs(self, batch_size=1000):
+        """
+        Add the new descriptions to the near-duplicate index, then keep one representative per cluster of
+        near-duplicates in the review queue: the others get `duplicate_of` set to it, in one UPDATE.
 
-    def scrap_ids(self):
-        self.request_job_codes(0)
+        Args:
+            batch_size (int, optional): Jobs indexed per transaction. Default is 1000.
 
-        soup = BeautifulSoup(self.driver.page_source, "html.parser")
+        Returns:
+            int: Number of jobs whose `duplicate_of` changed.
+        """
+        if self.duplicates is None:
+            return 0
+        last_id, indexed = -1, 0
+        while True:
+            with self.writer.lock:
+                self.writer.flush()
+                rows = self.conn.execute(self.DEDUPE_PENDING_QUERY, (last_id, batch_size)).fetchall()
+                if not rows:
+                    break
+                last_id = rows[-1][0]
+                texts = self.description_texts({text_hash for job_id, title, company, text_hash in rows})
+                for job_id, title, company, text_hash in rows:
+                    signature = self.duplicates.signature(title, company, texts.get(text_hash))
+                    if signature is not None:
+                        self.duplicates.add(job_id, text_hash, signature)
+                self.conn.commit()
+            indexed += len(rows)
+            logging.info(f"Indexed {indexed} jobs for near-duplicates")
+        with self.writer.lock:
+            cursor = self.conn.execute(self.MARK_DUPLICATES_QUERY)
+            self.conn.commit()
+        report = self.duplicates.report()
+        self.metrics.set("near_duplicate_jobs", report["duplicates"])
+        logging.info(f"Near-duplicates: {report}, {cursor.rowcount} jobs re-marked")
+        return cursor.rowcount
+
+    def description_texts(self, hashes):
+        """Text of the descriptions of `hashes`, by hash."""
+        hashes = list(hashes)
+        texts = {}
+        for i in range(0, len(hashes), 500):
+            chunk = hashes[i:i + 500]
+            placeholders = ", ".join("?" * len(chunk))
+            rows = self.conn.execute(f"SELECT text_hash, codec, body FROM descriptions WHERE text_hash IN ({placeholders})",
+                                     chunk)
+            texts.update((text_hash, self.descriptions.decompress(codec, body)) for text_hash, codec, body in rows)
+        return texts
+
+    def cached_languages(self, hashes):
+        hashes = list(hashes)
+        placeholders = ", ".join("?" * len(hashes))
+        rows = self.conn.execute(f"SELECT text_hash, language FROM language_cache WHERE text_hash IN ({placeholders})",
+                                 hashes)
+        return dict(rows.fetchall())
+
+    def classify_texts(self, texts, executor=None, chunk_size=50):
+        if executor is None:
+            return self.classify_chunk(texts)
+        chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+        return [result for chunk in executor.map(self.classify_chunk, chunks) for result in chunk]
+
+    @classmethod
+    def classify_chunk(cls, texts):
+        """Language and confidence of each text. Runs in a worker process of `detect_languages`."""
+        results = []
+        for text in texts:
+            language, confidence = cls.detect_language(text)
+            results.append((language, float(confidence) if language is not None else None))
+        return results
+
+    @staticmethod
+    def set_languages(languages):
+        """Restrict langid to `languages`, which makes it faster and avoids unlikely languages."""
+        if languages:
+            import langid
+            langid.set_languages(languages)
+
+    @staticmethod
+    def hash_text(text):
+        return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+    @stage("scrap_ids")
+    def scrap_ids(self, query=None, driver=None):
+        """
+        Collect the Job IDs of a search, `query` (see search_query()) or by default the search of this object.
 
-        try:
-            div_number_of_jobs = soup.find("div", {"class": "jobs-search-results-list__subtitle"})
-            number_of_jobs = int(div_number_of_jobs.find("span").get_text().strip().split()[0].replace(",", ""))
-        except:
-            number_of_jobs = 0
+        In incremental mode the search is restricted to the time since the previous crawl of the same query, and
+        paging stops once the results are older than the newest job seen by that crawl, or after
+        `known_pages_to_stop` pages in a row without any new ID. The newest ID is then saved as the query checkpoint.
+        """
+        query = self.search_query(query)
+        query_key = self.query_key(query)
+        checkpoint = self.load_checkpoint(query_key) if self.incremental else None
+        posted_within = None
+        if checkpoint:
+            last_seen_id, last_seen_at = checkpoint
+            elapsed = (datetime.datetime.now(pytz.utc) - datetime.datetime.fromisoformat(last_seen_at)).total_seconds()
+            if not query['more_recents'] or elapsed + 3600 < 604800:
+                posted_within = int(elapsed) + 3600
+            logging.info(f"Incremental crawl since job {last_seen_id} ({last_seen_at})")
+
+        number_of_jobs, Jobs_on_this_page = self.extractor.extract_search_page(
+            self.request_job_codes(0, posted_within, query, driver))
 
         number_of_pages = math.ceil(number_of_jobs / 25)
         logging.info(f"Number Jobs: {number_of_jobs}")
         logging.info(f"Number of pages: {number_of_pages}")
 
-        Jobs_on_this_page = self.find_job_ids(soup)
-        self.insert_job_ids(Jobs_on_this_page)
+        newest_id = max(self.numeric_ids(Jobs_on_this_page), default=None)
+        known_pages = 0
+        page_num = 0
+        fetched_pages = 1
+        while True:
+            if self.incremental:
+                new_ids = self.unknown_job_ids(Jobs_on_this_page)
+                known_pages = 0 if new_ids else known_pages + 1
+            distinct_ids = self.insert_job_ids(Jobs_on_this_page)
+            self.metrics.inc("job_ids_found_total", distinct_ids)
+            logging.info(f"Jobs found:{len(Jobs_on_this_page)} ({distinct_ids} new in this run)")
+
+            if self.incremental:
+                if checkpoint and max(self.numeric_ids(Jobs_on_this_page), default=0) <= checkpoint[0]:
+                    logging.info("Finish scrap ids, reached the jobs seen by the previous crawl")
+                    break
+                if known_pages >= self.known_pages_to_stop:
+                    logging.info(f"Finish scrap ids, {known_pages} page(s) without new jobs")
+                    break
+
+            page_num += 1
+            if page_num >= number_of_pages:
+                break
+            logging.info(f"Scraping page: {page_num}")
 
-        if number_of_pages > 1:
-            for page_num in range(1, number_of_pages):
-                logging.info(f"Scraping page: {page_num}")
+            # Get Job Ids present on the page.
+            Jobs_on_this_page = self.find_job_ids(self.request_job_codes(25 * page_num, posted_within, query, driver))
+            fetched_pages += 1
+            if len(Jobs_on_this_page) <= 0:
+                logging.info("Finish scrap ids, no more jobs found")
+                break
 
-                self.request_job_codes(25 * page_num)
-                soup = BeautifulSoup(self.driver.page_source, "html.parser")
+        if newest_id is not None:
+            if checkpoint:
+                newest_id = max(newest_id, checkpoint[0])
+            self.save_checkpoint(query_key, newest_id, fetched_pages)
 
-                # Get Job Ids present on the first page.
-                Jobs_on_this_page = self.find_job_ids(soup)
-                if len(Jobs_on_this_page) <= 0:
-                    logging.info("Finish scrap ids, no more jobs found")
-                    break
-                self.insert_job_ids(Jobs_on_this_page)
-                logging.info(f"Jobs found:{len(Jobs_on_this_page)}")
+    def query_key(self, query=None):
+        query = self.search_query(query)
+        return f"{query['keywords']}|{query['location']}|{int(bool(query['only_remote']))}|{int(bool(query['more_recents']))}"
+
+    @stage("schedule")
+    def schedule(self, queries=None, concurrency=None):
+        """
+        Collect the Job IDs of every query of config.yml, then scrap their details.
+
+        All queries share this object's database connection, rate limiter and sessions: up to `concurrency` of them
+        run at the same time, each holding one browser (Selenium engine) until it is done, and IDs returned by more
+        than one query are only written once.
+
+        Args:
+            queries (list, optional): Search parameters, see search_query(). Default is the queries section of config.yml.
+            concurrency (int, optional): Queries crawled at the same time. Default is scheduler.concurrent_queries.
+        """
+        queries = queries if queries is not None else self.config.get('queries') or []
+        if not queries:
+            logging.info("No queries to schedule")
+            return
+        concurrency = max(1, min(concurrency or self.concurrent_queries, len(queries)))
+        drivers = queue.Queue()
+        for driver in self.ensure_drivers(concurrency) if self.engine == 'selenium' else [None] * concurrency:
+            drivers.put(driver)
+
+        def crawl(query):
+            driver = drivers.get()
+            try:
+                query = self.search_query(query)
+                logging.info(f"Looking jobs {query['keywords']} - {query['location']}")
+                self.scrap_ids(query, driver)
+            except Exception as e:
+                logging.error(f"{query} - {repr(e)}")
+            finally:
+                drivers.put(driver)
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            list(executor.map(crawl, queries))
+        self.writer.flush()
+        logging.info(f"{len(self.seen_ids)} distinct job IDs from {len(queries)} queries")
+        logging.info(f"Rate limiter: {self.rate_limiter.report()}")
+        logging.info(f"Page readiness: {self.readiness.report()}")
+        if self.schedule_details:
+            self.scrap_details()
+
+    def crawl(self):
+        """
+        Collect the Job IDs of the search of this object and read their details (unless scheduler.scrap_details is
+        off), or schedule() the queries of config.yml when no keywords are set.
+        """
+        if not self.keywords:
+            return self.schedule()
+        logging.info(f"Looking jobs {self.keywords} - {self.location}")
+        self.scrap_ids()
+        self.writer.flush()
+        if self.schedule_details:
+            self.scrap_details()
+
+    @staticmethod
+    def numeric_ids(job_ids):
+        return [int(job_id) for job_id in job_ids if job_id and str(job_id).isdigit()]
+
+    def unknown_job_ids(self, job_ids):
+        """
+        The IDs of `job_ids` that were not in the jobs table before this run. IDs inserted by this run, e.g. by an
+        overlapping query of schedule(), are still new.
+        """
+        job_ids = self.numeric_ids(job_ids)
+        if not job_ids:
+            return []
+        with self.writer.lock:
+            self.writer.flush()
+            placeholders = ", ".join("?" * len(job_ids))
+            known = {row[0] for row in self.conn.execute(f"SELECT Job_ID FROM jobs WHERE Job_ID IN ({placeholders})",
+                                                         job_ids)}
+        with self.seen_lock:
+            unknown = [job_id for job_id in job_ids if job_id not in known or job_id in self.new_ids]
+            self.new_ids.update(unknown)
+        return unknown
+
+    def load_checkpoint(self, query_key):
+        """
+        Returns:
+            tuple: Newest Job ID seen by the previous crawl of the query and when, or None.
+        """
+        with self.writer.lock:
+            self.writer.flush()
+            row = self.conn.execute("SELECT last_seen_id, last_seen_at FROM crawl_checkpoints WHERE query_key = ?",
+                                    (query_key,)).fetchone()
+        return row
+
+    def save_checkpoint(self, query_key, last_seen_id, pages):
+        self.writer.add('''
+            INSERT OR REPLACE INTO crawl_checkpoints (query_key, last_seen_id, last_seen_at, pages) VALUES (?, ?, ?, ?)
+        ''', (query_key, last_seen_id, datetime.datetime.now(pytz.utc).isoformat(), pages))
+
+    @staticmethod
+    def detect_language(text):
+        import langid
 
-    def detect_language(self, text):
         try:
             language, confidence = langid.classify(text)
             return language, confidence
         except Exception as e:
             return None, str(e)
 
-    def scrap_details(self):
-        list_job_IDs = self.list_ids_details()
-        logging.info(f"Read details from {len(list_job_IDs)} jobs")
-        job_url = "https://www.linkedin.com/jobs/view/{}"
+    @stage("scrap_details")
+    def scrap_details(self, workers=None):
+        """
+        Scrap the details of every pending job with a pool of WebDriver workers.
 
-        for j in range(0, len(list_job_IDs)):
-            job = {}
-            logging.info(f"{j + 1} - reading jobId: {list_job_IDs[j]}")
+        Each worker owns one browser session, claims batches of IDs from the work queue (so several processes can
+        share the work) and hands the parsed rows back to this thread, which is the only one writing to the database.
+        Pages that cannot be read, or have no company, are retried with a backoff in later runs and dead-lettered
+        after work_queue.max_attempts failures.
 
-            self.driver.get(job_url.format(list_job_IDs[j]))
-            try:
-                random_sleep_duration = random.uniform(0.1, 2.0)
-                time.sleep(random_sleep_duration)
+        Args:
+            workers (int, optional): Number of browser sessions. Defaults to the `workers` setting.
+        """
+        ready = self.list_ids_details()["ready"]
+        if not ready:
+            logging.info("No job details to read")
+            return
+        workers = min(workers or self.workers, ready)
+        logging.info(f"Read details from {ready} jobs with {workers} worker(s)")
+
+        positions = itertools.count(1)
+        rows_queue = queue.Queue()
+
+        threads = []
+        drivers = self.ensure_drivers(workers) if self.engine == 'selenium' else [None] * workers
+        for driver in drivers:
+            thread = threading.Thread(target=self.details_worker, args=(driver, positions, rows_queue), daemon=True)
+            thread.start()
+            threads.append(thread)
+
+        finished = 0
+        try:
+            while finished < len(threads):
+                item = rows_queue.get()
+                if item is None:
+                    finished += 1
+                    continue
+                job_id, attempts, job, error = item
+                if job is not None:
+                    self.insert_job_details(job_data=job)
+                if error is None:
+                    self.work_queue.complete(job_id)
+                else:
+                    self.work_queue.fail(job_id, attempts, error)
+        finally:
+            self.work_queue.release()
+        logging.info(f"Work queue: {self.work_queue.report()}")
+        logging.info(f"Rate limiter: {self.rate_limiter.report()}")
+        logging.info(f"Browser timings: {self.browser_report()}")
+        logging.info(f"Page readiness: {self.readiness.report()}")
+        self.dedupe_jobs()
+        self.detect_languages()
+        self.compact_descriptions()
+
+    def details_worker(self, driver, positions, rows_queue):
+        """
+        Read the jobs claimed from the work queue until none is ready, putting (Job_ID, attempt, job or None,
+        error or None) on `rows_queue`, then None.
+        """
+        try:
+            while True:
+                try:
+                    claimed = self.work_queue.claim(self.claim_batch)
+                except sqlite3.Error as e:
+                    logging.error(f"Worker stopped, cannot claim jobs from the work queue - {e!r}")
+                    break
+                if not claimed:
+                    break
+                for job_id, attempts in claimed:
+                    logging.info(f"{next(positions)} - reading jobId: {job_id} (attempt {attempts}, "
+                                 f"{self.rate_limiter.rate:.1f} requests/min)")
+                    job, error = None, None
+                    try:
+                        with self.metrics.timer("job_details_seconds"):
+                            job = self.read_job_details(driver, job_id)
+                        if not job.get('company'):
+                            error = "no company in the page"
+                        self.metrics.inc("job_details_total", status="ok")
+                    except Exception as e:
+                        error = repr(e)
+                        self.metrics.inc("job_details_total", status="error")
+                        logging.error(f"{job_id} - {error}")
+                    rows_queue.put((job_id, attempts, job, error))
+        finally:
+            # scrap_details waits for one sentinel per worker, whatever stopped it
+            rows_queue.put(None)
 
-                if "Too Many Requests" in self.driver.page_source:
-                    logging.error("Got Too Many requests")
-                    time.sleep(30)
-                    self.driver.get(job_url.format(list_job_IDs[j]))
+    def read_job_details(self, driver, job_id):
+        """
+        Read one job page and parse its fields.
 
-                element_present = EC.presence_of_element_located((By.CLASS_NAME, 'ui-label--accent-3'))
-                WebDriverWait(self.driver, 10).until(element_present)
-            except:
-                time.sleep(10)
-                self.driver.get(job_url.format(list_job_IDs[j]))
+        With the HTTP engine the page is fetched without a browser and Selenium is only used, on `driver` or on the
+        shared main driver when `driver` is None, if the HTML lacks the top card markup.
+        """
+        job_url = f"{self.base_url}/jobs/view/{job_id}"
+
+        if self.engine == 'http':
+            html = self.http_get(job_url)
+            with self.metrics.timer("parse_seconds", backend=self.extractor.backend):
+                job = self.parse_job_details(html, job_id, self.extractor) if html else None
+            if job and job["job_title"] is not None:
+                self.archive_page(job, html)
+                return job
+            logging.info(f"{job_id} - HTML lacks the top card, falling back to Selenium")
+
+        if driver is None:
+            with self.fallback_lock:
+                return self.read_job_details_selenium(self.driver, job_url, job_id)
+        return self.read_job_details_selenium(driver, job_url, job_id)
+
+    def read_job_details_selenium(self, driver, job_url, job_id):
+        from selenium.webdriver.common.by import By
+
+        self.browser_get(driver, job_url)
+        if not self.readiness.top_card(driver):
+            # Closed or deleted postings have no description either, only reload pages without a title
+            if not driver.find_elements(By.CSS_SELECTOR, JobExtractor.SELECTORS["job_title"]):
+                self.browser_get(driver, job_url)
+                self.readiness.top_card(driver)
+        self.readiness.dom_settled(driver)
+
+        with self.metrics.timer("parse_seconds", backend="browser"):
+            job = self.extractor.extract_rendered_job(driver, job_id, with_html=self.archive is not None)
+        html = job.pop("html", None)
+        if html is not None:
+            self.archive_page(job, html)
+        return self.complete_job(job)
+
+    def archive_page(self, job, html):
+        """Store the raw page in the archive; the index row is written with the job details."""
+        if self.archive is not None:
+            job["archive_sha256"] = self.archive.put(html)
+            job["fetched_at"] = datetime.datetime.now(pytz.utc).strftime('%Y-%m-%dT%H:%M:%S%z')
+
+    @classmethod
+    def parse_job_details(cls, html, job_id, extractor=None):
+        """Parse the fields of a job page, then date the posting and hash the description (see complete_job)."""
+        return cls.complete_job((extractor or JobExtractor()).extract_job(html, job_id))
+
+    @classmethod
+    def complete_job(cls, job):
+        """Date the posting and hash the description; the language is detected later by detect_languages."""
+        job["language"] = None
+        job["text_hash"] = cls.hash_text(job["Job_txt"]) if job["Job_txt"] is not None else None
+        job["date_post"] = cls.parse_relative_time(job["posted_time_ago"]) if job["posted_time_ago"] is not None else None
+        return job
+
+    @classmethod
+    def parse_archived_page(cls, item):
+        """
+        Re-run the field extraction on one archived page. Runs in a worker process of `reparse`.
 
-            soup = BeautifulSoup(self.driver.page_source, "html.parser")
+        Returns:
+            dict: The job fields, or None when the page is missing, truncated or not valid gzip.
+        """
+        job_id, path, backend = item
+        try:
+            with gzip.open(path, "rb") as f:
+                html = f.read().decode("utf-8")
+        except (OSError, EOFError, gzip.BadGzipFile) as e:
+            logging.error(f"{job_id} - cannot read the archived page {path}, skipped - {e!r}")
+            return None
+        return cls.parse_job_details(html, job_id, JobExtractor(backend))
+
+    @stage("reparse")
+    def reparse(self, processes=None, batch_size=500):
+        """
+        Re-extract the job fields from the latest archived page of every job, without any network access.
 
-            job["Job_ID"] = list_job_IDs[j]
+        Pages are parsed on a process pool and the results are upserted into `jobs` in batches, keeping the
+        `applied` flag and the scraping date of each row. Languages are then detected for the changed descriptions.
 
-            try:
-                elements = self.driver.find_elements(By.XPATH,
-                                                     "//span[@class='job-details-jobs-unified-top-card__job-insight-view-model-secondary']")
-                if len(elements) <= 2:
-                    remote_element = self.driver.find_element(By.XPATH,
-                                                              "//span[contains(@class, 'ui-label--accent-3')]")
-                    if remote_element:
-                        job["type_work"] = remote_element.text.split('\n')[0] if len(
-                            remote_element.text.split('\n')) > 0 else remote_element.text
-                    else:
-                        job["type_work"] = ''
-
-                    contract_element = self.driver.find_elements(By.XPATH,
-                                                                 "//span[@class='job-details-jobs-unified-top-card__job-insight-view-model-secondary']")[
-                        0]
-                    if contract_element:
-                        job["time_work"] = contract_element.text.split('\n')[0] if len(
-                            contract_element.text.split('\n')) > 0 else contract_element.text
-                    else:
-                        job["time_work"] = ''
-
-                    level_element = self.driver.find_elements(By.XPATH,
-                                                              "//span[@class='job-details-jobs-unified-top-card__job-insight-view-model-secondary']")[
-                        1] if len(elements) > 1 else []
-                    if level_element:
-                        job["level"] = level_element.text.split('\n')[0] if len(
-                            level_element.text.split('\n')) > 0 else level_element.text
-                    else:
-                        job["level"] = ''
-                else:
-                    job["type_work"] = elements[0].text.split('\n')[0] if len(elements[0].text.split('\n')) > 0 else \
-                    elements[0].text
-                    job["time_work"] = elements[1].text.split('\n')[0] if len(elements[1].text.split('\n')) > 0 else \
-                    elements[1].text
-                    job["level"] = elements[2].text.split('\n')[0] if len(elements[2].text.split('\n')) > 0 else \
-                    elements[2].text
-            except:
-                job["type_work"] = ""
-                job["time_work"] = ""
-                job["level"] = ""
-
-            try:  # remove tags
-                description_tag = soup.find("div",
-                                            class_="jobs-box__html-content jobs-description-content__text t-14 t-normal jobs-description-content__text--stretch").text
-                description = description_tag
-
-                job["Job_txt"] = description
-                language, confidence = self.detect_language(description)
-                job["language"] = language
-            except:
-                job["Job_txt"] = None
-                job["language"] = None
+        Args:
+            processes (int, optional): Number of parser processes. Default is the number of CPUs.
+            batch_size (int, optional): Progress is logged every `batch_size` pages. Default is 500.
+        """
+        archive = self.archive or HtmlArchive((self.config.get('archive') or {}).get('path', 'archive'))
+        self.writer.flush()
+        cursor = self.conn.cursor()
+        cursor.execute('''
+            SELECT Job_ID, sha256, MAX(fetched_at) FROM page_archive GROUP BY Job_ID
+        ''')
+        items = [(job_id, archive.path(digest), self.extractor.backend)
+                 for job_id, digest, fetched_at in cursor.fetchall()]
+        logging.info(f"Reparsing {len(items)} archived pages")
+
+        upsert_query = '''
+            INSERT INTO jobs (Job_ID, type_work, time_work, level, text_hash, company, job_title, location, posted_time_ago, date_post, nb_candidats, fit, employes, sector, details_pending)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (Job_ID) DO UPDATE SET
+                type_work = excluded.type_work, time_work = excluded.time_work, level = excluded.level,
+                text_hash = excluded.text_hash, company = excluded.company,
+                job_title = excluded.job_title, location = excluded.location,
+                posted_time_ago = excluded.posted_time_ago, date_post = excluded.date_post,
+                nb_candidats = excluded.nb_candidats, fit = excluded.fit, employes = excluded.employes,
+                sector = excluded.sector, details_pending = excluded.details_pending
+        '''
+        columns = ['Job_ID', 'type_work', 'time_work', 'level', 'text_hash', 'company', 'job_title',
+                   'location', 'posted_time_ago', 'date_post', 'nb_candidats', 'fit', 'employes', 'sector']
+        done = skipped = 0
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            for job in executor.map(self.parse_archived_page, items, chunksize=64):
+                if job is None:
+                    skipped += 1
+                    continue
+                row = tuple(job[column] for column in columns) + (0 if job['company'] else 1,)
+                if job['Job_txt'] is not None:
+                    self.writer.add(DescriptionStore.INSERT_QUERY, self.descriptions.row(job['text_hash'], job['Job_txt']))
+                self.writer.add(upsert_query, row)
+                done += 1
+                if done % batch_size == 0:
+                    logging.info(f"Reparsed {done}/{len(items)} pages")
+        self.writer.flush()
+        logging.info(f"Reparse finished: {done} jobs updated, {skipped} unreadable pages skipped")
+        self.dedupe_jobs()
+        self.detect_languages()
+        self.compact_descriptions()
+
+    REVIEW_CONDITIONS = """
+                            "language" IN ('en', 'pt') 
+                            AND type_work IN ('Remote', '')
+                            AND "level" NOT IN ('Director', 'Entry level')
+                            AND (time_work not in ('Contract') or language in ('br','pt'))
+                            AND applied IS null
+                            AND closed IS null
+                            AND duplicate_of IS null
+                       """
 
-            try:
-                job["company"] = soup.find("div",
-                                           class_="job-details-jobs-unified-top-card__company-name").text.replace("\n",
-                                                                                                                  "")
-            except:
-                job["company"] = None
+    # Keysets of iter_jobs: the condition selecting the rows after the last one read, and the values it compares
+    # taken from that row. Job_ID breaks the ties of date_post, so the review order is total; jobs without a date
+    # come last, as they did with ORDER BY date_post DESC. The bound on date_post alone lets SQLite seek in
+    # idx_jobs_review, which it does not do for the row value comparison.
+    JOB_ID_KEYSET = ("j.Job_ID > ?", lambda row: (row["Job_ID"],))
+    REVIEW_KEYSET = ("IFNULL(j.date_post, '') <= ? AND (IFNULL(j.date_post, ''), j.Job_ID) < (?, ?)",
+                     lambda row: (row["date_post"] or '', row["date_post"] or '', row["Job_ID"]))
+    REVIEW_ORDER = "IFNULL(j.date_post, '') DESC, j.Job_ID DESC"
+
+    # Job_txt is left out, job_txt() reads it when a description is really needed
+    FETCH_JOBS_QUERY = f"""
+                       SELECT Job_ID, job_title, company, location, type_work, time_work, level, language, date_post,
+                            ? || '/jobs/view/' || Job_ID AS link
+                            FROM jobs j 
+                            WHERE {REVIEW_CONDITIONS}
+                            AND {{after}}
+                            ORDER BY {REVIEW_ORDER}
+                       """
 
-            try:
-                job["job_title"] = soup.find("div",
-                                             class_="t-24 job-details-jobs-unified-top-card__job-title").text.replace(
-                    "\n", "")
-            except:
-                job["job_title"] = None
+    COUNT_JOBS_QUERY = f"""SELECT COUNT(*) FROM jobs j WHERE {REVIEW_CONDITIONS}"""
 
-            location_details = soup.find("div", class_="job-details-jobs-unified-top-card__tertiary-description")
+    def fetch_jobs(self):
+        """
+        Stream the review candidates, newest first.
 
-            try:
-                job["location"] = location_details.contents[1].text
-            except:
-                job["location"] = None
+        Yields:
+            sqlite3.Row: The columns of FETCH_JOBS_QUERY, by name.
+        """
+        return self.iter_jobs(self.FETCH_JOBS_QUERY, (self.base_url,), self.REVIEW_KEYSET)
 
-            try:
-                job["posted_time_ago"] = location_details.contents[3].text
-                job["date_post"] = self.parse_relative_time(job["posted_time_ago"])
-            except:
-                job["posted_time_ago"] = None
-                job["date_post"] = None
+    def count_jobs(self):
+        self.writer.flush()
+        return self.read_conn.execute(self.COUNT_JOBS_QUERY).fetchone()[0]
 
-            try:
-                job["nb_candidats"] = location_details.contents[5].text
-            except:
-                job["nb_candidats"] = None
+    @staticmethod
+    def page_query(query, condition):
+        """`query` reading one chunk: the rows matching `condition` (its {after} placeholder), up to LIMIT ?."""
+        return f"{query.format(after=condition)} LIMIT ?"
 
-            try:
-                job["fit"] = soup.find("div", class_="display-flex flex-row align-items-center mt4").text.replace("\n",
-                                                                                                                  "").strip()
-            except:
-                job["fit"] = None
+    def iter_jobs(self, query=None, params=(), keyset=None, chunk_size=None, limit=None):
+        """
+        Stream the rows of `query` through the read connection, `chunk_size` rows in memory at a time.
 
-            li_tags = soup.find_all('li', class_='job-details-jobs-unified-top-card__job-insight')
-            try:
-                if len(li_tags[1].get_text(strip=True).split("·")) == 2:
-                    job["employes"] = li_tags[1].get_text(strip=True).split("·")[0]
-                    job["sector"] = li_tags[1].get_text(strip=True).split("·")[1].strip()
-                else:
-                    job["employes"] = li_tags[1].get_text(strip=True)
-                    job["sector"] = None
-            except:
-                job["employes"] = None
-                job["sector"] = None
+        Every chunk is read by its own statement, resuming after the last row of the previous chunk (keyset
+        pagination), so no statement stays open between chunks: a long review does not hold a WAL read snapshot
+        that would stop the checkpoints of a concurrent crawl.
 
-            self.insert_job_details(job_data=job)
+        Args:
+            query (str, optional): SQL to run, with an {after} placeholder in its WHERE clause after every other
+                parameter, ordered by the keyset. Default is every column of `jobs` but Job_txt, by Job_ID.
+            params (tuple, optional): Parameters of `query`.
+            keyset (tuple, optional): Condition on the last row read and the function taking its values from that
+                row, like REVIEW_KEYSET. Default is JOB_ID_KEYSET.
+            chunk_size (int, optional): Rows fetched at once. Default is the `database.chunk_size` setting.
+            limit (int, optional): Most rows read, the LIMIT of the last chunk is cut to what is left. Default is all.
+
+        Yields:
+            sqlite3.Row: One row, with its columns accessible by name.
+        """
+        self.writer.flush()
+        if query is None:
+            columns = [column for column in self.job_columns() if column != "Job_txt"]
+            query = f"SELECT {', '.join(columns)} FROM jobs j WHERE {{after}} ORDER BY j.Job_ID"
+        condition, key = keyset or self.JOB_ID_KEYSET
+        chunk_size = chunk_size or self.chunk_size
+        remaining = math.inf if limit is None else limit
+        after, values = "1", ()
+        while remaining > 0:
+            size = int(min(chunk_size, remaining))
+            rows = self.read_conn.execute(self.page_query(query, after), (*params, *values, size)).fetchall()
+            yield from rows
+            if len(rows) < size:
+                break
+            remaining -= len(rows)
+            after, values = condition, key(rows[-1])
 
-    def fetch_jobs(self):
-        one_month_ago = datetime.datetime.now() - datetime.timedelta(days=30)
-        formatted_date = one_month_ago.strftime('%Y-%m-%dT%H:%M:%S%z')
+    def job_columns(self):
+        """Name and declared type of every column of `jobs`."""
+        return {row[1]: row[2] for row in self.read_conn.execute("PRAGMA table_info(jobs)")}
 
-        sql = """
-                       SELECT *,
-                            "https://www.linkedin.com/jobs/view/"||Job_ID AS link
-                            FROM jobs j 
-                            WHERE "language" IN ('en', 'pt') 
-                            AND type_work IN ('Remote', '')
-                            AND "level" NOT IN ('Director', 'Entry level')
-                            AND (time_work not in ('Contract') or language in ('br','pt'))
-                            AND applied IS null
-                            ORDER BY date_post DESC   
-                       """
-        cursor = self.conn.cursor()
-        cursor.execute(sql)
-        jobs = cursor.fetchall()
-        return jobs
+    def job_txt(self, job_id):
+        """Description of one job, read on demand."""
+        row = self.read_conn.execute("SELECT d.codec, d.body FROM jobs j JOIN descriptions d ON d.text_hash = j.text_hash "
+                                     "WHERE j.Job_ID = ?", (job_id,)).fetchone()
+        return self.descriptions.decompress(row[0], row[1]) if row else None
+
+    @stage("export")
+    def export(self, path, chunk_size=None):
+        """
+        Stream the `jobs` table to `path` as JSON lines (".jsonl"), CSV (".csv") or Parquet (".parquet", needs
+        pyarrow), holding at most `chunk_size` rows in memory. The file is written under a temporary name and
+        renamed once complete.
+
+        Returns:
+            int: Number of exported jobs.
+        """
+        chunk_size = chunk_size or self.chunk_size
+        self.writer.flush()
+        columns = self.job_columns()
+        expressions = ["description(d.codec, d.body) AS Job_txt" if column == "Job_txt" else f"j.{column}"
+                       for column in columns]
+        rows = self.iter_jobs(f"SELECT {', '.join(expressions)} FROM jobs j "
+                              f"LEFT JOIN descriptions d ON d.text_hash = j.text_hash "
+                              f"WHERE {{after}} ORDER BY j.Job_ID",
+                              chunk_size=chunk_size)
+        extension = os.path.splitext(path)[1].lower()
+        tmp_path = f"{path}.tmp"
+        if extension == ".jsonl":
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                count = 0
+                for row in rows:
+                    f.write(json.dumps(dict(row), ensure_ascii=False) + "\n")
+                    count += 1
+        elif extension == ".csv":
+            with open(tmp_path, "w", encoding="utf-8", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(columns)
+                count = 0
+                for row in rows:
+                    writer.writerow(row)
+                    count += 1
+        elif extension == ".parquet":
+            count = self.export_parquet(tmp_path, columns, rows, chunk_size)
+        else:
+            raise ValueError(f"Unknown export format {extension!r}, use .jsonl, .csv or .parquet")
+        os.replace(tmp_path, path)
+        self.metrics.inc("jobs_exported_total", count, format=extension[1:])
+        logging.info(f"Exported {count} jobs to {path}")
+        return count
+
+    @staticmethod
+    def export_parquet(path, columns, rows, chunk_size):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise RuntimeError("Parquet export needs pyarrow (pip install pyarrow)")
+        types = {"INTEGER": pyarrow.int64(), "REAL": pyarrow.float64()}
+        schema = pyarrow.schema([(name, types.get(declared.upper(), pyarrow.string()))
+                                 for name, declared in columns.items()])
+        count = 0
+        with pyarrow.parquet.ParquetWriter(path, schema, compression="zstd") as writer:
+            while True:
+                chunk = [tuple(row) for row in itertools.islice(rows, chunk_size)]
+                if not chunk:
+                    break
+                writer.write_table(pyarrow.Table.from_pylist([dict(zip(columns, row)) for row in chunk], schema))
+                count += len(chunk)
+        return count
 
     def update_job_status(self, job_id):
-        cursor = self.conn.cursor()
-        cursor.execute("UPDATE jobs SET applied = 1 WHERE Job_ID = ?", (job_id,))
-        self.conn.commit()
+        self.writer.add("UPDATE jobs SET applied = 1 WHERE Job_ID = ?", (job_id,))
 
     def active_window(self):
         window_handle = self.driver.window_handles[0]
         self.driver.switch_to.window(window_handle)
 
-    def wait_for_page_load(self, timeout=10):
-        try:
-            WebDriverWait(self.driver, timeout).until(
-                lambda d: d.execute_script('return document.readyState') == 'complete'
-            )
-            return True
-        except Exception as e:
-            logging.error(f"Error to load page: {e}")
-            return False
+    def wait_for_page_load(self):
+        return self.readiness.document_complete(self.driver) and self.readiness.dom_settled(self.driver)
 
-    def filter_job(self, job):
-        keywords_to_exclude_title = ['fullstack', 'principal', 'mobile', 'lead', 'security', 'reliability', 'java',
-                                     'react', 'Cloud', 'DevOps', 'azure', 'full-stack',
-                                     'located', 'sales', 'node', 'head', 'sap', 'full stack',
-                                     '.NET', 'ui', 'ux', 'dba', 'manager', 'frontend', 'ios', 'staff',
-                                     'Intern', 'validation', 'Embedded', 'firmware', 'Infrastructure',
-                                     'Android', 'Flutter', 'coach', 'Consultant', 'DevSecOps', 'ml', 'llm',
-                                     'machine', 'scala', 'databricks', 'spark', 'ruby', 'Electrical',
+    # Defaults of the `filters` section of config.yml
+    EXCLUDE_TITLE = ['fullstack', 'principal', 'mobile', 'lead', 'security', 'reliability', 'java',
+                     'react', 'Cloud', 'DevOps', 'azure', 'full-stack',
+                     'located', 'sales', 'node', 'head', 'sap', 'full stack',
+                     '.NET', 'ui', 'ux', 'dba', 'manager', 'frontend', 'ios', 'staff',
+                     'Intern', 'validation', 'Embedded', 'firmware', 'Infrastructure',
+                     'Android', 'Flutter', 'coach', 'Consultant', 'DevSecOps', 'ml', 'llm',
+                     'machine', 'scala', 'databricks', 'spark', 'ruby', 'Electrical']
+    EXCLUDE_DESCRIPTION = ['react', 'Experience with Node.js', '.NET', 'php', 'vue',
+                           'angular', 'frontend']
 
+    def filter_job(self, job):
+        return not self.job_filter.rejects(job["job_title"], self.job_txt(job["Job_ID"]))
 
-                                     ]
-        keywords_to_exclude_description = ['react', 'Experience with Node.js', '.NET', 'php', 'vue',
-                                           'angular', 'frontend']
-
-        job_title = job[5].lower() if job[5] else ''
-        if any(keyword.lower() in job_title for keyword in keywords_to_exclude_title):
-            return False
+    @stage("prefilter_jobs")
+    def prefilter_jobs(self):
+        """
+        Mark every review candidate rejected by the filters as applied, in one UPDATE using the `job_rejected`
+        SQL function, so navigate_jobs only gets jobs worth opening.
 
-        job_description = job[3].lower()
-        if any(keyword.lower() in job_description for keyword in keywords_to_exclude_description):
-            return False
-        return True
+        Returns:
+            int: Number of jobs filtered out.
+        """
+        with self.writer.lock:
+            self.writer.flush()
+            cursor = self.conn.execute(f"""
+                UPDATE jobs SET applied = 1
+                WHERE Job_ID IN (SELECT Job_ID FROM jobs j WHERE {self.REVIEW_CONDITIONS})
+                AND job_rejected(job_title, (SELECT description(d.codec, d.body) FROM descriptions d
+                                             WHERE d.text_hash = jobs.text_hash))
+            """)
+            self.conn.commit()
+        logging.info(f"Filtered {cursor.rowcount} jobs")
+        return cursor.rowcount
 
-    def accept_applications(self):
-        self.wait_for_page_load()
-        time.sleep(0.5)
-        soup = BeautifulSoup(self.driver.page_source, "html.parser")
-        text = soup.find("span", {"class": "artdeco-inline-feedback__message"})
-        #tittle = soup.find("div", class_="t-24 job-details-jobs-unified-top-card__job-title")
-        tittle = soup.select_one(".t-24.job-details-jobs-unified-top-card__job-title")
+    def accept_applications(self, html=None):
+        """
+        Check whether the job is still open, on the page loaded in the browser or on `html` when given.
+        """
+        if html is None:
+            self.wait_for_page_load()
+            html = self.driver.page_source
+        tittle, text = self.extractor.extract_liveness(html)
         if not tittle:
             logging.info("Job deleted.")
             return False
-        text = text.get_text(strip=True) if text else ''
         if text == 'No longer accepting applications':
             return False
         return True
 
+    def check_liveness(self, job):
+        """
+        Check over HTTP whether a review candidate still accepts applications.
+
+        Returns:
+            str: "open", "closed", or "unknown" when the page has no top card and only a browser can tell.
+        """
+        status, html = self.http_fetch(job["link"])
+        if status in (404, 410):
+            return "closed"
+        if status is None or status >= 400 or "job-details-jobs-unified-top-card__job-title" not in html:
+            return "unknown"
+        return "open" if self.accept_applications(html) else "closed"
+
+    def review_candidates(self, executor=None):
+        """
+        Yield each review candidate with its liveness, checking the next `lookahead` candidates in the background.
+
+        Yields:
+            tuple: The candidate row and "open", "closed" or "unknown" (see check_liveness).
+        """
+        if executor is None:
+            for job in self.fetch_jobs():
+                yield job, "unknown"
+            return
+        def result(future):
+            try:
+                return future.result()
+            except Exception as e:
+                logging.error(f"Liveness check failed: {repr(e)}")
+                return "unknown"
+
+        pending = collections.deque()
+        for job in self.fetch_jobs():
+            pending.append((job, executor.submit(self.check_liveness, job)))
+            if len(pending) > self.lookahead:
+                job, future = pending.popleft()
+                yield job, result(future)
+        while pending:
+            job, future = pending.popleft()
+            yield job, result(future)
+
+    def close_job(self, job_id):
+        logging.info(f"{job_id} - Not accept applications")
+        self.metrics.inc("jobs_reviewed_total", result="closed")
+        self.update_job_status(job_id)
+        self.record_liveness([(job_id, "closed")])
+
+    def record_liveness(self, results):
+        """
+        Save the (Job_ID, status) results of liveness checks, with the time of the check, in one batch. "unknown"
+        results (network errors, throttling, unreadable pages) are not saved, so those jobs stay due.
+        """
+        checked_at = datetime.datetime.now(pytz.utc).strftime('%Y-%m-%dT%H:%M:%S')
+        self.writer.add_many("UPDATE jobs SET closed = ?, checked_at = ? WHERE Job_ID = ?",
+                             [(1 if status == "closed" else None, checked_at, job_id) for job_id, status in results
+                              if status in ("open", "closed")])
+
+    # (age in days, hours between two checks): a job posted in the last 3 days is re-checked every 12 hours, ...
+    RECHECK_TIERS = [[3, 12], [14, 48], [60, 168], [None, 720]]
+
+    def recheck_query(self):
+        """Review candidates due for a liveness check under the age tiers, newest first, with the link to check."""
+        age = "julianday('now') - julianday(COALESCE(substr(date_post, 1, 19), scraping_date))"
+        interval = "CASE " + " ".join(f"WHEN {age} <= {int(days)} THEN {int(hours)}"
+                                      for days, hours in self.recheck_tiers if days is not None)
+        interval += f" ELSE {int(self.recheck_tiers[-1][1])} END"
+        return f"""
+            SELECT Job_ID, date_post, ? || '/jobs/view/' || Job_ID AS link FROM jobs j
+            WHERE {self.REVIEW_CONDITIONS}
+            AND (checked_at IS NULL
+                 OR checked_at < strftime('%Y-%m-%dT%H:%M:%S', 'now', '-' || ({interval}) || ' hours'))
+            AND {{after}}
+            ORDER BY {self.REVIEW_ORDER}
+        """
+
+    @stage("recheck")
+    def recheck(self, workers=None, limit=None):
+        """
+        Check over HTTP whether the review candidates due under the age tiers still accept applications.
+
+        Recent jobs are checked more often than old ones (recheck.tiers). The checks run concurrently through the
+        shared rate limiter and are saved in batches: closed jobs get `closed = 1` and leave the review queue, and
+        every job found open or closed gets its `checked_at` time; jobs whose status is unknown are due again in
+        the next run.
+
+        Args:
+            workers (int, optional): Concurrent checks. Default is the recheck.workers setting.
+            limit (int, optional): Most jobs checked in this run. Default is the recheck.max_jobs setting.
+
+        Returns:
+            dict: Number of jobs per status.
+        """
+        jobs = list(self.iter_jobs(self.recheck_query(), (self.base_url,), self.REVIEW_KEYSET,
+                                   limit=limit or self.recheck_limit))
+        logging.info(f"Re-checking {len(jobs)} jobs")
+        counts = collections.Counter()
+        results = []
+        with ThreadPoolExecutor(max_workers=workers or self.recheck_workers) as executor:
+            for job, status in zip(jobs, executor.map(self.check_liveness, jobs)):
+                counts[status] += 1
+                self.metrics.inc("jobs_rechecked_total", status=status)
+                results.append((job["Job_ID"], status))
+                if len(results) >= 100:
+                    self.record_liveness(results)
+                    results = []
+                if sum(counts.values()) % 100 == 0:
+                    logging.info(f"Re-checked {sum(counts.values())}/{len(jobs)} jobs: {dict(counts)}")
+        self.record_liveness(results)
+        self.writer.flush()
+        if counts["closed"] and self.duplicates is not None:
+            # The reposts of a closed representative may have a new one, which needs its language
+            self.dedupe_jobs()
+            self.detect_languages()
+        logging.info(f"Re-check finished: {dict(counts)}")
+        return dict(counts)
+
+    def next_live_job(self, candidates):
+        """Next candidate not known to be closed, marking the closed ones as applied on the way."""
+        for job, status in candidates:
+            if status != "closed":
+                return job, status
+            self.close_job(job["Job_ID"])
+        return None, None
+
+    def preload(self, link, cancel=None):
+        """
+        Start loading `link` in a background tab, without taking the focus from the job the user is looking at.
+
+        Args:
+            cancel (threading.Event, optional): Gives up, even during a rate limiter backoff, once it is set.
+
+        Returns:
+            str: Window handle of the new tab, or None when cancelled.
+        """
+        if not self.rate_limiter.acquire(cancel):
+            return None
+        handles = set(self.driver.window_handles)
+        target = self.driver.execute_cdp_cmd("Target.createTarget", {"url": link, "background": True})
+        if target.get("targetId") in self.driver.window_handles:
+            return target["targetId"]
+        return (set(self.driver.window_handles) - handles).pop()
+
+    def show_job(self, job, status, handle=None):
+        """
+        Bring the job to the front, in its preloaded tab when there is one, closing the tab of the previous job.
+
+        Returns:
+            bool: False when the page shows that the job is closed.
+        """
+        if handle is not None:
+            if len(self.driver.window_handles) > 1:
+                self.driver.close()
+            self.driver.switch_to.window(handle)
+        else:
+            self.browser_get(self.driver, job["link"])
+        if status == "unknown" and not self.accept_applications():
+            return False
+        return True
+
+    @stage("navigate_jobs")
     def navigate_jobs(self):
+        """
+        Open the review candidates one by one in the browser.
+
+        While the user looks at a job, the liveness of the next `lookahead` candidates is checked over HTTP in the
+        background, closed ones are marked as applied, and the next live job is loaded in a background tab, so it is
+        shown as soon as the user presses Enter. With review.lookahead set to 0 every job is checked in the browser.
+        """
+        if not self.drivers:
+            # The review browser is always visible, whatever browser.headless says, and shows images and fonts
+            # unless review.lean is set
+            self.drivers.append(self.connect_selenium(headless=False, lean=self.review_lean))
         self.active_window()
-        jobs = self.fetch_jobs()
-        logging.info(f"Starting navigate for {len(jobs)} jobs")
-        for job in jobs:
-            job_id, link = job[0], job[-1]
-            if not self.filter_job(job):
-                logging.info(f"{job_id} - Filtered")
-                self.update_job_status(job_id)
-                continue
-            self.driver.get(link)
-            if not self.accept_applications():
-                logging.info(f"{job_id} - Not accept applications")
+        self.prefilter_jobs()
+        logging.info(f"Starting navigate for {self.count_jobs()} jobs")
+        executor = ThreadPoolExecutor(max_workers=self.lookahead) if self.lookahead > 0 else None
+        try:
+            candidates = self.review_candidates(executor)
+            job, status = self.next_live_job(candidates)
+            handle, waiting_since = None, None
+            while job is not None:
+                job_id, link = job["Job_ID"], job["link"]
+                if not self.show_job(job, status, handle):
+                    self.close_job(job_id)
+                    job, status = self.next_live_job(candidates)
+                    handle = None
+                    continue
+                if waiting_since is not None:
+                    self.metrics.observe("review_wait_seconds", time.perf_counter() - waiting_since)
+                logging.info(f"Opened job link: {link}")
+
+                prefetched = {}
+                cancel = threading.Event()
+
+                def prefetch():
+                    try:
+                        prefetched["job"], prefetched["status"] = self.next_live_job(candidates)
+                        if executor is not None and prefetched["job"] is not None and not cancel.is_set():
+                            prefetched["handle"] = self.preload(prefetched["job"]["link"], cancel)
+                    except Exception as e:
+                        prefetched["error"] = e
+
+                # The prefetch thread is the only one driving the browser until it is joined
+                prefetcher = threading.Thread(target=prefetch, daemon=True)
+                prefetcher.start()
+                user_input = input("Press Enter to open the next job link or type 'exit' to quit: \n")
+                if user_input.lower() == 'exit':
+                    # Not joined: the prefetch may be waiting for a throttle backoff
+                    cancel.set()
+                    break
+                waiting_since = time.perf_counter()
+                prefetcher.join()
+                self.metrics.inc("jobs_reviewed_total", result="opened")
                 self.update_job_status(job_id)
-                random_sleep_duration = random.uniform(0.1, 2.0)
-                time.sleep(random_sleep_duration)
-                continue
-            self.active_window()
-            logging.info(f"Opened job link: {link}")
-            user_input = input("Press Enter to open the next job link or type 'exit' to quit: \n")
-            if user_input.lower() == 'exit':
-                break
-            self.update_job_status(job_id)
+                if "error" in prefetched:
+                    logging.error(f"Prefetch failed: {repr(prefetched['error'])}")
+                    job, status = self.next_live_job(candidates)
+                    handle = None
+                else:
+                    job, status, handle = prefetched["job"], prefetched["status"], prefetched.get("handle")
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+    # Subcommands: the first argument that is not an option, "review" (navigate_jobs) when there is none
+    COMMANDS = ["crawl", "details", "lang", "review", "export", "stats", "schedule", "reparse", "recheck", "compact",
+                "dedupe"]
+
+    USAGE = """Usage: python main.py [command] [options]
+
+Commands:
+  crawl                             collect the job IDs of --keywords/--location (of every configured query when
+                                    no keywords are given), then read their details
+  details                           read the details of the jobs in the work queue
+  lang                              detect the language of the new descriptions
+  review                            open the review candidates in the browser (default)
+  export <file.jsonl/csv/parquet>   stream the jobs table to a file
+  stats                             print counts of the database
+  schedule                          crawl every query of config.yml, then read their details (--workers,
+                                    --max_rate, --engine, --incremental)
+  reparse                           re-extract the job fields from the archived pages, without network access
+  recheck                           check over HTTP whether the due review candidates are still open (--max_rate)
+  compact                           retrain the description dictionary and recompress the descriptions
+  dedupe                            group the near-duplicate reposts and detect the language of the new ones
+
+Options: [--keywords <keywords>] [--location <location>] [--only_remote <True/False>] [--more_recents <True/False>]
+         [--workers <N>] [--max_rate <requests/min>] [--engine <selenium/http>] [--incremental <True/False>]
+         [--metrics <file.prom/file.json>] [--profile]"""
+
+    @classmethod
+    def parse_arguments(cls, argv):
+        """
+        Read the command and the options, before the database is opened: -h and usage errors print the usage and
+        exit. Options may come before or after the command; the former --schedule, --reparse, --recheck, --compact,
+        --dedupe and --export <file> options still select a command.
 
-    def parse_arguments(self, argv):
+        Returns:
+            dict: Attributes of ScrapLinkedin to set, see apply_arguments().
+        """
         try:
-            opts, args = getopt.getopt(argv, "h", ["keywords=", "location=", "only_remote=", "more_recents="])
+            opts, args = getopt.gnu_getopt(argv, "h", ["keywords=", "location=", "only_remote=", "more_recents=",
+                                                   "workers=", "max_rate=", "engine=", "reparse", "incremental=", "schedule",
+                                                   "metrics=", "profile", "export=", "compact", "recheck", "dedupe"])
         except getopt.GetoptError:
-            print("Usage: python script.py --keywords <keywords> --location <location> [--only_remote <True/False>] [--more_recents <True/False>]")
+            print(cls.USAGE)
             sys.exit(2)
+        arguments = {}
+        if args:
+            if args[0] not in cls.COMMANDS or len(args) != (2 if args[0] == 'export' else 1):
+                print(cls.USAGE)
+                sys.exit(2)
+            arguments["command"] = args[0]
+            if args[0] == 'export':
+                arguments["export_path"] = args[1]
 
         for opt, arg in opts:
             if opt == '-h':
-                print("Usage: python script.py --keywords <keywords> --location <location> [--only_remote <True/False>] [--more_recents <True/False>]")
+                print(cls.USAGE)
                 sys.exit()
             elif opt == "--keywords":
-                self.keywords = arg
+                arguments["keywords"] = arg
             elif opt == "--location":
-                self.location = arg
+                arguments["location"] = arg
             elif opt == "--only_remote":
-                self.only_remote = arg.lower() == "true"
+                arguments["only_remote"] = arg.lower() == "true"
             elif opt == "--more_recents":
-                self.more_recents = arg.lower() == "true"
-
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        self.driver.close()
+                arguments["more_recents"] = arg.lower() == "true"
+            elif opt == "--workers":
+                arguments["workers"] = int(arg)
+            elif opt == "--incremental":
+                arguments["incremental"] = arg.lower() == "true"
+            elif opt == "--reparse":
+                arguments["command"] = 'reparse'
+            elif opt == "--schedule":
+                arguments["command"] = 'schedule'
+            elif opt == "--export":
+                arguments["command"] = 'export'
+                arguments["export_path"] = arg
+            elif opt == "--recheck":
+                arguments["command"] = 'recheck'
+            elif opt == "--compact":
+                arguments["command"] = 'compact'
+            elif opt == "--dedupe":
+                arguments["command"] = 'dedupe'
+            elif opt == "--metrics":
+                arguments["metrics_path"] = arg
+            elif opt == "--profile":
+                arguments["profile_path"] = "profile.pstats"
+            elif opt == "--engine":
+                arguments["engine"] = arg
+            elif opt == "--max_rate":
+                arguments["max_rate"] = float(arg)
+        return arguments
+
+    def apply_arguments(self, arguments):
+        """Set the attributes read by parse_arguments()."""
+        for name, value in arguments.items():
+            setattr(self, name, value)
+        if "max_rate" in arguments:
+            self.rate_limiter = RateLimiter(self.max_rate, self.min_rate)
+
+    def run_command(self):
+        if self.command == 'crawl':
+            self.crawl()
+        elif self.command == 'details':
+            self.scrap_details()
+        elif self.command == 'lang':
+            self.detect_languages()
+        elif self.command == 'stats':
+            self.stats()
+        elif self.command == 'reparse':
+            self.reparse()
+        elif self.command == 'schedule':
+            self.schedule()
+        elif self.command == 'export':
+            self.export(self.export_path)
+        elif self.command == 'recheck':
+            self.recheck()
+        elif self.command == 'compact':
+            self.compact_descriptions(force=True)
+        elif self.command == 'dedupe':
+            self.dedupe_jobs()
+            self.detect_languages()
+        else:
+            self.navigate_jobs()
+
+    def run(self):
+        """
+        Run the command given on the command line. With --profile the run is profiled with cProfile, the stats are
+        saved to `profile_path` for pstats/snakeviz and the most expensive calls are logged. Only the main thread is
+        profiled; the time of the worker threads shows up in the metrics.
+        """
+        if not self.profile_path:
+            return self.run_command()
+        profiler = cProfile.Profile()
+        try:
+            return profiler.runcall(self.run_command)
+        finally:
+            profiler.dump_stats(self.profile_path)
+            stream = io.StringIO()
+            pstats.Stats(profiler, stream=stream).sort_stats("cumulative").print_stats(30)
+            logging.info(f"Profile saved to {self.profile_path}\n{stream.getvalue()}")
 
+    def stats(self):
+        """
+        Print the state of the database as JSON: jobs by stage, review candidates, languages, work queue,
+        description storage and near-duplicates. Only reads the database.
 
-if __name__ == '__main__':
-    parameters = []
-    parameters.append(dict(keyword='python', location='Brazil'))
-    parameters.append(dict(keyword='data analytics', location='Brazil'))
-    parameters.append(dict(keyword='engenheiro de dados', location='Brazil'))
-    parameters.append(dict(keyword='business intelligence', location='Brazil'))
-    parameters.append(dict(keyword='data engineer', location='Brazil'))
-    parameters.append(dict(keyword='data engineer', location='European Economic Area'))
-    parameters.append(dict(keyword='data engineer', location='United Arab Emirates'))
-
-    scrap = None
-    """
-    for x in parameters:
-        logging.info(f"Looking jobs {x['keyword']} - {x['location']}")
-        scrap = ScrapLinkedin(x['keyword'], x['location'])
-        scrap.parse_arguments(sys.argv[1:])
-        scrap.scrap_ids()
-    scrap.scrap_details()
-    """
-    scrap = ScrapLinkedin('', '')
-    scrap.navigate_jobs()
+        Returns:
+            dict: The printed statistics.
+        """
+        self.writer.flush()
+        jobs = self.read_conn.execute("""
+            SELECT COUNT(*) AS jobs, SUM(details_pending = 0) AS with_details, SUM(language IS NOT NULL) AS with_language,
+                SUM(applied IS NOT NULL) AS applied, SUM(closed IS NOT NULL) AS closed,
+                SUM(duplicate_of IS NOT NULL) AS duplicates, MAX(scraping_date) AS last_scraping_date
+            FROM jobs
+        """).fetchone()
+        stats = {
+            "jobs": {key: jobs[key] or 0 for key in jobs.keys() if key != "last_scraping_date"},
+            "last_scraping_date": jobs["last_scraping_date"],
+            "review_candidates": self.count_jobs(),
+            "languages": dict(self.read_conn.execute("SELECT COALESCE(language, 'unknown'), COUNT(*) FROM jobs "
+                                                     "WHERE text_hash IS NOT NULL GROUP BY 1 ORDER BY 2 DESC").fetchall()),
+            "work_queue": self.work_queue.report(),
+            "descriptions": DescriptionStore.report(self.conn),
+            "near_duplicates": self.duplicates.report() if self.duplicates is not None else None,
+        }
+        print(json.dumps(stats, indent=2))
+        return stats
+
+    def write_metrics(self):
+        """Export the metrics to `metrics_path` (Prometheus text for ".prom", JSON otherwise), if set."""
+        if not self.metrics_path:
+            return
+        rate_limiter = self.rate_limiter.report()
+        self.metrics.set("rate_limiter_requests_per_minute", rate_limiter["rate_per_minute"])
+        self.metrics.set("rate_limiter_throttles", rate_limiter["throttles"])
+        self.metrics.write(self.metrics_path)
+        logging.info(f"Metrics written to {self.metrics_path}")
+
+    def close(self):
+        """Flush pending writes, export the metrics and release the browsers, the HTTP session and the database connection."""
+        self.writer.close()
+        self.write_metrics()
+        for driver in self.drivers:
+            try:
+                driver.quit()
+            except Exception as e:
+                logging.error(f"Error closing browser: {repr(e)}")
+        self.drivers = []
+        for f in self.profile_locks:
+            f.close()
+        self.profile_locks = []
+        if self.http_fetcher is not None:
+            self.http_fetcher.session.close()
+            self.http_fetcher = None
+        if self.reader is not None:
+            self.reader.close()
+            self.reader = None
+        self.conn.close()
+
+    def __enter__(self):
+        return self
 
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
 
 
+if __name__ == '__main__':
+    arguments = ScrapLinkedin.parse_arguments(sys.argv[1:])
+    with ScrapLinkedin('', '') as scrap:
+        scrap.apply_arguments(arguments)
+        scrap.run()
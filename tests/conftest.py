@@ -0,0 +1,96 @@
+import os
+import random
+import sqlite3
+import sys
+
+import pytest
+import yaml
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from main import ScrapLinkedin  # noqa: E402
+
+# The jobs table as created before the first migration (PRAGMA user_version 0)
+BASELINE_SCHEMA = '''
+    CREATE TABLE jobs (
+    Job_ID INTEGER PRIMARY KEY,
+    type_work TEXT,
+    time_work TEXT,
+    Job_txt TEXT,
+    company TEXT,
+    job_title TEXT,
+    level TEXT,
+    location TEXT,
+    posted_time_ago TEXT,
+    nb_candidats TEXT,
+    fit TEXT,
+    employes TEXT,
+    sector TEXT,
+    scraping_date DATE,
+    date_post TEXT,
+    language TEXT,
+    applied INTEGER
+)
+'''
+
+# Vocabulary of the generated job descriptions
+WORDS = ("data engineer python sql pipelines cloud warehouse team remote experience airflow spark modeling "
+         "analytics quality testing design build maintain scalable reliable batch streaming business").split()
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """Temporary current directory holding config.yml of the repo, pointed at a database in it, without archive."""
+    with open(os.path.join(REPO_DIR, "config.yml"), "r") as f:
+        config = yaml.safe_load(f)
+    config["archive"] = {"enabled": False}
+    config["metrics"] = {"path": None}
+    config["database"]["path"] = str(tmp_path / "jobs.db")
+    with open(tmp_path / "config.yml", "w") as f:
+        yaml.safe_dump(config, f)
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def baseline_db(workdir):
+    """Path of a database with the baseline schema and a few jobs, details and descriptions included."""
+    path = workdir / "jobs.db"
+    conn = sqlite3.connect(path)
+    conn.execute(BASELINE_SCHEMA)
+    conn.executemany("INSERT INTO jobs (Job_ID, Job_txt, company, job_title, language, date_post) VALUES (?, ?, ?, ?, ?, ?)",
+                     [(1, "Python and SQL for data pipelines.", "Acme", "Data Engineer", "en", "2024-01-01"),
+                      (2, "Python and SQL for data pipelines.", "Acme", "Data Engineer", "en", "2024-01-02"),
+                      (3, None, None, None, None, None)])
+    conn.commit()
+    conn.close()
+    return path
+
+
+@pytest.fixture
+def scrap(workdir):
+    with ScrapLinkedin("data engineer", "Brazil") as scrap:
+        yield scrap
+
+
+@pytest.fixture
+def posting():
+    """Factory of reproducible job descriptions: posting(seed, words=300) draws `words` words of WORDS."""
+    def make(seed, words=300):
+        generator = random.Random(seed)
+        return " ".join(generator.choice(WORDS) for _ in range(words))
+    return make
+
+
+@pytest.fixture
+def job_details():
+    """Factory of the dicts insert_job_details takes: job_details(job_id, text, **columns overriding the defaults)."""
+    def make(job_id, text, **columns):
+        job = {"Job_ID": job_id, "type_work": "Remote", "time_work": "Full-time", "level": "Mid-Senior level",
+               "language": None, "company": "Acme", "job_title": "Data Engineer", "location": "Brazil",
+               "posted_time_ago": "1 day ago", "date_post": "2024-01-01", "nb_candidats": "", "fit": "",
+               "employes": "", "sector": "", "Job_txt": text, "text_hash": ScrapLinkedin.hash_text(text)}
+        job.update(columns)
+        return job
+    return make
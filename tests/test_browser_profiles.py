@@ -0,0 +1,28 @@
+from main import ScrapLinkedin
+
+
+def test_every_browser_gets_a_free_profile(scrap, workdir):
+    scrap.browser["user_data_dir"] = "profiles"
+    assert scrap.claim_profile() == "profiles/worker-0"
+    assert scrap.claim_profile() == "profiles/worker-1"
+    with ScrapLinkedin("data engineer", "Brazil") as other:
+        other.browser["user_data_dir"] = "profiles"
+        assert other.claim_profile() == "profiles/worker-2"
+    # Released by close()
+    assert scrap.claim_profile() == "profiles/worker-2"
+
+
+def test_no_profile_without_user_data_dir(scrap):
+    scrap.browser["user_data_dir"] = None
+    assert scrap.claim_profile() is None
+
+
+def test_review_browser_is_not_lean_by_default(scrap):
+    scrap.browser["lean"] = True
+    assert scrap.review_lean is False
+    scraping = scrap.chrome_options()
+    review = scrap.chrome_options(headless=False, lean=scrap.review_lean)
+    assert "--blink-settings=imagesEnabled=false" in scraping.arguments
+    assert scraping.page_load_strategy == "eager"
+    assert "--blink-settings=imagesEnabled=false" not in review.arguments
+    assert review.page_load_strategy == "normal"
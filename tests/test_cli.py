@@ -0,0 +1,19 @@
+import pytest
+
+from main import ScrapLinkedin
+
+
+@pytest.mark.parametrize("argv, code", [(["-h"], None), (["bogus"], 2), (["--nope"], 2)])
+def test_usage_exits_without_opening_the_database(workdir, capsys, argv, code):
+    with pytest.raises(SystemExit) as exit_info:
+        ScrapLinkedin.parse_arguments(argv)
+    assert exit_info.value.code == code
+    assert capsys.readouterr().out.startswith("Usage:")
+    assert not (workdir / "jobs.db").exists()
+
+
+def test_arguments_are_applied(scrap):
+    arguments = ScrapLinkedin.parse_arguments(["--workers", "3", "export", "jobs.csv", "--max_rate", "2"])
+    assert arguments == {"command": "export", "export_path": "jobs.csv", "workers": 3, "max_rate": 2.0}
+    scrap.apply_arguments(arguments)
+    assert (scrap.command, scrap.export_path, scrap.workers, scrap.rate_limiter.max_rate) == ("export", "jobs.csv", 3, 2.0)
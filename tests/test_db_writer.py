@@ -0,0 +1,36 @@
+import sqlite3
+
+from main import DbWriter
+
+
+def test_rows_are_kept_while_another_connection_holds_the_lock(tmp_path):
+    path = tmp_path / "jobs.db"
+    conn = sqlite3.connect(path, timeout=0.1, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("CREATE TABLE jobs (Job_ID INTEGER PRIMARY KEY)")
+    conn.commit()
+    writer = DbWriter(conn, flush_interval=3600)
+    other = sqlite3.connect(path, isolation_level=None)
+    other.execute("BEGIN IMMEDIATE")
+    try:
+        writer.add_many("INSERT INTO jobs (Job_ID) VALUES (?)", [(11,), (12,), (13,)])
+        writer.flush()
+        assert writer.pending_rows == 3
+        writer.add("INSERT INTO jobs (Job_ID) VALUES (?)", (14,))
+    finally:
+        other.execute("ROLLBACK")
+    writer.close()
+    assert conn.execute("SELECT Job_ID FROM jobs ORDER BY Job_ID").fetchall() == [(11,), (12,), (13,), (14,)]
+    other.close()
+    conn.close()
+
+
+def test_rows_rejected_for_their_data_are_skipped(tmp_path):
+    conn = sqlite3.connect(tmp_path / "jobs.db", check_same_thread=False)
+    conn.execute("CREATE TABLE jobs (Job_ID INTEGER PRIMARY KEY)")
+    writer = DbWriter(conn, flush_interval=3600)
+    writer.add_many("INSERT INTO jobs (Job_ID) VALUES (?)", [(1,), (1,), (2,)])
+    writer.close()
+    assert conn.execute("SELECT Job_ID FROM jobs ORDER BY Job_ID").fetchall() == [(1,), (2,)]
+    assert writer.pending_rows == 0
+    conn.close()
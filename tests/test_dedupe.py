@@ -0,0 +1,77 @@
+import random
+import sqlite3
+
+import pytest
+
+from main import NearDuplicateIndex
+
+
+def repost(text, seed, changes=2):
+    generator = random.Random(seed)
+    words = text.split()
+    for _ in range(changes):
+        words[generator.randrange(len(words))] = generator.choice(words)
+    return " ".join(words) + f" Reference {seed}."
+
+
+@pytest.fixture
+def index():
+    conn = sqlite3.connect(":memory:")
+    conn.execute("ATTACH DATABASE ':memory:' AS lsh")
+    index = NearDuplicateIndex(conn)
+    index.create()
+    yield index
+    conn.close()
+
+
+def add(index, job_id, title, company, text):
+    return index.add(job_id, None, index.signature(title, company, text))
+
+
+def test_reposts_share_a_cluster_and_other_postings_stay_apart(index, posting):
+    original, other = posting(1), posting(2)
+    assert add(index, 10, "Data Engineer", "Acme", original) == 10
+    assert add(index, 11, "Data Engineer", "Acme", repost(original, 11)) == 10
+    assert add(index, 12, "Data Engineer", "Acme", repost(original, 12)) == 10
+    assert add(index, 13, "Data Engineer", "Acme", other) == 13
+    assert add(index, 14, "Senior Data Engineer", "Acme", posting(3)) == 14
+    assert index.report() == {"postings": 5, "clusters": 3, "clusters_with_duplicates": 1, "duplicates": 2}
+
+
+def test_a_posting_joining_two_clusters_merges_them(posting):
+    conn = sqlite3.connect(":memory:")
+    conn.execute("ATTACH DATABASE ':memory:' AS lsh")
+    index = NearDuplicateIndex(conn, bands=64, threshold=0.5)
+    index.create()
+    # first and second share half of their words, middle three quarters with each
+    first = posting(1)
+    second = " ".join(first.split()[:150] + posting(2).split()[150:])
+    middle = " ".join(first.split()[:225] + second.split()[225:])
+    assert add(index, 1, "", None, first) == 1
+    assert add(index, 2, "", None, second) == 2
+    assert add(index, 3, "", None, middle) == 1
+    assert index.report() == {"postings": 3, "clusters": 1, "clusters_with_duplicates": 1, "duplicates": 2}
+    conn.close()
+
+
+def test_short_postings_get_a_full_signature(index):
+    signature = index.signature("Data Engineer", None, "python")
+    assert len(signature) == index.permutations
+    assert signature == index.signature("data engineer", None, "Python!")
+    assert index.signature(None, None, "") is None
+
+
+def test_only_the_oldest_open_repost_is_reviewed(scrap, posting, job_details):
+    original = posting(1)
+    texts = {1: original, 2: repost(original, 2), 3: repost(original, 3), 4: posting(4)}
+    for job_id, text in texts.items():
+        scrap.insert_job_details(job_details(job_id, text, date_post=f"2024-01-0{job_id}"))
+    scrap.dedupe_jobs()
+    duplicates = dict(scrap.conn.execute("SELECT Job_ID, duplicate_of FROM jobs").fetchall())
+    assert duplicates == {1: None, 2: 1, 3: 1, 4: None}
+
+    scrap.record_liveness([(1, "closed")])
+    scrap.writer.flush()
+    scrap.dedupe_jobs()
+    duplicates = dict(scrap.conn.execute("SELECT Job_ID, duplicate_of FROM jobs").fetchall())
+    assert duplicates == {1: 2, 2: None, 3: 2, 4: None}
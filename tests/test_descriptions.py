@@ -0,0 +1,40 @@
+import pytest
+
+from main import ScrapLinkedin
+
+pytest.importorskip("zstandard")
+
+
+@pytest.fixture
+def insert_jobs(scrap, posting, job_details):
+    def insert(job_ids):
+        for job_id in job_ids:
+            scrap.insert_job_details(job_details(job_id, posting(job_id, 200)))
+        scrap.writer.flush()
+    return insert
+
+
+def test_dictionary_trained_by_another_process_is_loaded(scrap, insert_jobs):
+    insert_jobs(range(1, 201))
+    with ScrapLinkedin("data engineer", "Brazil") as other:
+        text = other.job_txt(1)
+        scrap.compact_descriptions(force=True)
+        assert scrap.descriptions.dictionary_id == 1
+        assert other.job_txt(1) == text
+        assert other.compact_descriptions()["descriptions"] == 200
+
+
+def test_retraining_keeps_the_dictionaries_other_processes_compress_with(scrap, insert_jobs):
+    insert_jobs(range(1, 201))
+    with ScrapLinkedin("data engineer", "Brazil") as other:
+        scrap.compact_descriptions(force=True)
+        other.compact_descriptions(force=True)
+        assert other.descriptions.dictionary_id == 2
+        # Still compressing with dictionary 1
+        insert_jobs([201])
+        codec = scrap.conn.execute("SELECT codec FROM descriptions d JOIN jobs j ON j.text_hash = d.text_hash "
+                                   "WHERE j.Job_ID = 201").fetchone()[0]
+        assert codec == "zstd:1"
+        assert other.job_txt(201) == scrap.job_txt(201)
+        other.compact_descriptions(force=True)
+        assert scrap.job_txt(201) == other.job_txt(201)
@@ -0,0 +1,52 @@
+import csv
+import json
+
+import pytest
+
+
+@pytest.fixture
+def jobs(scrap, posting, job_details):
+    # Ties on date_post and jobs without a date around the chunk boundaries
+    dates = ["2024-01-03", "2024-01-02", "2024-01-02", "2024-01-02", None, "2024-01-01", None]
+    for job_id, date_post in enumerate(dates, 1):
+        scrap.insert_job_details(job_details(job_id, posting(job_id, 50), date_post=date_post, language="en",
+                                             job_title=f"Data Engineer, {job_id}\n\"senior\""))
+    scrap.writer.flush()
+    return scrap
+
+
+def test_review_candidates_are_streamed_in_review_order(jobs):
+    expected = [row[0] for row in jobs.conn.execute(
+        f"SELECT Job_ID FROM jobs j WHERE {jobs.REVIEW_CONDITIONS} ORDER BY date_post DESC, Job_ID DESC")]
+    assert expected == [1, 4, 3, 2, 6, 7, 5]
+    for chunk_size in (1, 2, 3, 100):
+        assert [job["Job_ID"] for job in jobs.iter_jobs(jobs.FETCH_JOBS_QUERY, (jobs.base_url,), jobs.REVIEW_KEYSET,
+                                                        chunk_size=chunk_size)] == expected
+
+
+def test_streaming_holds_no_read_snapshot_between_chunks(jobs):
+    rows = jobs.iter_jobs(chunk_size=2)
+    assert next(rows)["Job_ID"] == 1
+    jobs.conn.execute("UPDATE jobs SET applied = 1 WHERE Job_ID = 7")
+    jobs.conn.commit()
+    busy, log_frames, checkpointed = jobs.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchone()
+    assert busy == 0
+    assert [row["Job_ID"] for row in rows] == [2, 3, 4, 5, 6, 7]
+
+
+@pytest.mark.parametrize("extension", [".jsonl", ".csv"])
+def test_export_round_trips(jobs, extension):
+    path = f"jobs{extension}"
+    assert jobs.export(path, chunk_size=2) == 7
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        if extension == ".jsonl":
+            rows = [json.loads(line) for line in f]
+        else:
+            rows = list(csv.DictReader(f))
+    assert [str(row["Job_ID"]) for row in rows] == [str(job_id) for job_id in range(1, 8)]
+    for row in rows:
+        job_id = int(row["Job_ID"])
+        assert row["Job_txt"] == jobs.job_txt(job_id)
+        assert row["job_title"] == f"Data Engineer, {job_id}\n\"senior\""
+        assert row["company"] == "Acme"
+    assert set(rows[0]) == set(jobs.job_columns())
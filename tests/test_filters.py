@@ -0,0 +1,42 @@
+import pytest
+
+from main import JobFilter, ScrapLinkedin
+
+TITLES = ["Data Engineer", "Senior .NET Developer", "Dotnet Engineer", "ASP.NET Data Engineer", "Full-Stack Engineer",
+          "Full Stack Engineer", "Fullstack Engineer", "Full stack-ish Engineer", "UI Engineer", "Build Engineer",
+          "Quality Engineer", "ML Engineer", "HTML Developer", "Data Engineer (m/f/d)", "Data Engineer [Remote]",
+          "Data Engineer + Analyst", "Data Engineer *", "Data Engineer? Yes", "Data Engineer ^ Python $",
+          "Data Engineer | BI", "Tech LEAD", "Engenheiro de Dados Sênior", "Engineer, Machine Learning", "", None]
+DESCRIPTIONS = ["Python and SQL for data pipelines.", "We use .NET and C#.", "We use dotNET.", "Experience with Node.js",
+                "Experience with Node_js", "Experience with node.js and react", "Reactive streams in Scala",
+                "Vue.js frontend", "Front-end work", "PHP 8", "Regex a.c and (x|y) are fine", ""]
+
+
+def old_filter_job(title, description):
+    """filter_job before the filters were compiled: True when the job is kept."""
+    job_title = title.lower() if title else ''
+    if any(keyword.lower() in job_title for keyword in ScrapLinkedin.EXCLUDE_TITLE):
+        return False
+    job_description = description.lower()
+    if any(keyword.lower() in job_description for keyword in ScrapLinkedin.EXCLUDE_DESCRIPTION):
+        return False
+    return True
+
+
+@pytest.mark.parametrize("title", TITLES)
+@pytest.mark.parametrize("description", DESCRIPTIONS)
+def test_compiled_filter_matches_the_keyword_loops(title, description):
+    job_filter = JobFilter(ScrapLinkedin.EXCLUDE_TITLE, ScrapLinkedin.EXCLUDE_DESCRIPTION)
+    assert job_filter.rejects(title, description) == (not old_filter_job(title, description))
+
+
+def test_prefilter_rejects_the_rows_of_the_keyword_loops(scrap, job_details):
+    scrap.job_filter = JobFilter(ScrapLinkedin.EXCLUDE_TITLE, ScrapLinkedin.EXCLUDE_DESCRIPTION)
+    jobs = [(title, description) for title in TITLES for description in DESCRIPTIONS if description]
+    for job_id, (title, description) in enumerate(jobs, 1):
+        scrap.insert_job_details(job_details(job_id, description, job_title=title, language="en"))
+    scrap.writer.flush()
+    expected = {job_id for job_id, (title, description) in enumerate(jobs, 1)
+                if not old_filter_job(title, description)}
+    assert scrap.prefilter_jobs() == len(expected)
+    assert {row[0] for row in scrap.conn.execute("SELECT Job_ID FROM jobs WHERE applied = 1")} == expected
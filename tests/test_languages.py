@@ -0,0 +1,24 @@
+import langid
+
+
+def test_repost_of_a_known_description_uses_the_language_cache(scrap, posting, job_details, monkeypatch):
+    calls = []
+    classify = langid.classify
+
+    def counting(text):
+        calls.append(text)
+        return classify(text)
+    monkeypatch.setattr(langid, "classify", counting)
+    text = posting(1)
+    scrap.insert_job_details(job_details(1, text))
+    scrap.detect_languages(processes=1)
+    assert len(calls) == 1
+
+    scrap.insert_job_details(job_details(2, text))
+    scrap.detect_languages(processes=1)
+    assert len(calls) == 1
+    languages = dict(scrap.conn.execute("SELECT Job_ID, language FROM jobs").fetchall())
+    assert languages == {1: "en", 2: "en"}
+    # Nothing is left to detect
+    scrap.detect_languages(processes=1)
+    assert len(calls) == 1
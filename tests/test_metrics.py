@@ -0,0 +1,16 @@
+from main import Metrics
+
+
+def test_prometheus_label_values_are_escaped():
+    metrics = Metrics()
+    metrics.inc("fetch_errors_total", error='ConnectionError("a\\\\b")\nretry')
+    assert 'fetch_errors_total{error="ConnectionError(\\"a\\\\\\\\b\\")\\nretry"} 1' in metrics.prometheus().splitlines()
+
+
+def test_prometheus_histogram_series():
+    metrics = Metrics(buckets=[0.1, 1])
+    metrics.observe("page_load_seconds", 0.5, engine="http")
+    lines = metrics.prometheus().splitlines()
+    assert 'page_load_seconds_bucket{engine="http",le="0.1"} 0' in lines
+    assert 'page_load_seconds_bucket{engine="http",le="+Inf"} 1' in lines
+    assert 'page_load_seconds_count{engine="http"} 1' in lines
@@ -0,0 +1,38 @@
+import pytest
+
+from main import ScrapLinkedin
+
+
+def query_plan(scrap, sql, params):
+    return [row[3] for row in scrap.conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+
+
+def test_baseline_database_is_migrated(baseline_db):
+    with ScrapLinkedin("", "") as scrap:
+        assert scrap.conn.execute("PRAGMA user_version").fetchone()[0] == ScrapLinkedin.MIGRATIONS[-1][0]
+        rows = scrap.conn.execute("SELECT Job_ID, Job_txt, text_hash, details_pending FROM jobs ORDER BY Job_ID").fetchall()
+        assert [(job_id, job_txt, details_pending) for job_id, job_txt, text_hash, details_pending in rows] == [
+            (1, None, 0), (2, None, 0), (3, None, 1)]
+        assert rows[0][2] == rows[1][2] is not None
+        assert scrap.job_txt(1) == "Python and SQL for data pipelines."
+        assert scrap.conn.execute("SELECT codec FROM descriptions").fetchall() == [("zlib",)]
+
+
+def test_migrations_are_applied_once(baseline_db):
+    with ScrapLinkedin("", ""):
+        pass
+    with ScrapLinkedin("", "") as scrap:
+        scrap.migrate()
+        assert scrap.conn.execute("PRAGMA user_version").fetchone()[0] == ScrapLinkedin.MIGRATIONS[-1][0]
+
+
+@pytest.mark.parametrize("database", ["fresh", "baseline"])
+@pytest.mark.parametrize("name", ["list_ids_details", "claim_details", "fetch_jobs", "detect_languages", "recheck"])
+def test_hot_queries_are_indexed(request, database, name):
+    request.getfixturevalue("baseline_db" if database == "baseline" else "workdir")
+    with ScrapLinkedin("", "") as scrap:
+        assert set(scrap.hot_queries()) == {"list_ids_details", "claim_details", "fetch_jobs", "detect_languages",
+                                            "recheck"}
+        plan = query_plan(scrap, *scrap.hot_queries()[name])
+        assert not [step for step in plan if (step.startswith("SCAN") and "USING" not in step) or "TEMP B-TREE" in step]
+        assert scrap.check_query_plans() == {}
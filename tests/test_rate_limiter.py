@@ -0,0 +1,37 @@
+from main import RateLimiter
+
+
+def test_floor_above_ceiling_is_clamped_to_the_ceiling():
+    limiter = RateLimiter(2, 6)
+    assert limiter.min_rate == 2
+    assert limiter.rate == 2
+    limiter.throttled()
+    assert limiter.rate == 2
+
+
+def test_start_rate_is_clamped_to_the_bounds():
+    assert RateLimiter(10, 2, start_per_minute=50).rate == 10
+    assert RateLimiter(10, 2, start_per_minute=1).rate == 2
+    assert RateLimiter(10).rate == 5
+
+
+def test_rate_grows_additively_up_to_the_ceiling():
+    limiter = RateLimiter(10, 2, start_per_minute=8, increase=1)
+    limiter.success()
+    assert limiter.rate == 9
+    for _ in range(5):
+        limiter.success()
+    assert limiter.rate == 10
+
+
+def test_rate_is_cut_multiplicatively_down_to_the_floor_and_opens_the_circuit():
+    limiter = RateLimiter(16, 2, start_per_minute=16, decrease=0.5, breaker_threshold=4)
+    rates = []
+    for _ in range(4):
+        limiter.throttled()
+        rates.append(limiter.rate)
+    assert rates == [8, 4, 2, 2]
+    assert limiter.circuit_open
+    limiter.success()
+    assert limiter.consecutive_throttles == 0
+    assert limiter.rate == 3
@@ -0,0 +1,39 @@
+from main import PageReadiness
+
+
+class FakeDriver:
+    """Answers SEARCH_RESULTS_SCRIPT with the (count, no results banner) pairs of `states`, the last one repeated."""
+
+    def __init__(self, states):
+        self.states = states
+        self.calls = 0
+
+    def execute_script(self, script, *args):
+        self.calls += 1
+        return list(self.states[min(self.calls, len(self.states)) - 1])
+
+
+def readiness():
+    return PageReadiness({"search_results": 1}, poll_interval=0.01)
+
+
+def test_empty_list_is_not_stable_before_rendering():
+    driver = FakeDriver([(0, False)] * 60 + [(25, False)])
+    assert readiness().search_results(driver)
+    assert driver.calls == 61
+
+
+def test_no_results_banner_ends_the_wait():
+    driver = FakeDriver([(0, False)] * 3 + [(0, True)])
+    assert readiness().search_results(driver)
+    assert driver.calls == 4
+
+
+def test_partial_last_page_is_ready_once_stable():
+    driver = FakeDriver([(0, False)] * 5 + [(7, False)])
+    assert readiness().search_results(driver)
+    assert driver.calls < 80
+
+
+def test_empty_list_without_banner_times_out():
+    assert not readiness().search_results(FakeDriver([(0, False)]))
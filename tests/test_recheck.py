@@ -0,0 +1,33 @@
+import pytest
+
+
+@pytest.fixture
+def candidates(scrap):
+    scrap.conn.executemany("INSERT INTO jobs (Job_ID, language, type_work, level, time_work, date_post) "
+                           "VALUES (?, 'en', 'Remote', 'Mid-Senior level', 'Full-time', date('now'))", [(1,), (2,), (3,)])
+    scrap.conn.commit()
+    return scrap
+
+
+def due(scrap):
+    return [job["Job_ID"] for job in scrap.iter_jobs(scrap.recheck_query(), (scrap.base_url,), scrap.REVIEW_KEYSET)]
+
+
+def test_unknown_results_stay_due(candidates, monkeypatch):
+    statuses = {1: "open", 2: "closed", 3: "unknown"}
+    monkeypatch.setattr(candidates, "check_liveness", lambda job: statuses[job["Job_ID"]])
+    assert candidates.recheck(workers=2) == {"open": 1, "closed": 1, "unknown": 1}
+    assert due(candidates) == [3]
+    assert candidates.conn.execute("SELECT Job_ID, closed FROM jobs WHERE checked_at IS NOT NULL").fetchall() == \
+        [(1, None), (2, 1)]
+
+
+def test_limit_is_read_in_sql(candidates, monkeypatch):
+    checked = []
+    monkeypatch.setattr(candidates, "check_liveness", lambda job: checked.append(job["Job_ID"]) or "open")
+    statements = []
+    candidates.read_conn.set_trace_callback(statements.append)
+    assert candidates.recheck(workers=1, limit=2) == {"open": 2}
+    candidates.read_conn.set_trace_callback(None)
+    assert sorted(checked) == [2, 3]
+    assert [statement.rstrip().endswith("LIMIT 2") for statement in statements] == [True]
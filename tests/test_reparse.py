@@ -0,0 +1,31 @@
+import os
+
+from main import HtmlArchive
+
+FIXTURES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks", "fixtures")
+
+
+def test_reparse_skips_unreadable_pages(scrap, workdir):
+    archive = HtmlArchive(str(workdir / "archive"))
+    scrap.archive = archive
+    with open(os.path.join(FIXTURES, "job_view_remote_fulltime.html"), "r") as f:
+        good = archive.put(f.read())
+    truncated = archive.put("<html>" + "x" * 10000 + "</html>")
+    with open(archive.path(truncated), "rb") as f:
+        data = f.read()
+    with open(archive.path(truncated), "wb") as f:
+        f.write(data[:len(data) // 2])
+    corrupt = archive.put("<html>corrupt</html>")
+    with open(archive.path(corrupt), "wb") as f:
+        f.write(b"not gzip at all")
+    missing = "ab" * 32
+    scrap.conn.executemany("INSERT INTO page_archive (Job_ID, fetched_at, sha256) VALUES (?, ?, ?)",
+                           [(1, "2024-01-01", good), (2, "2024-01-01", truncated), (3, "2024-01-01", corrupt),
+                            (4, "2024-01-01", missing)])
+    scrap.conn.commit()
+
+    scrap.reparse(processes=1)
+
+    rows = dict(scrap.conn.execute("SELECT Job_ID, job_title FROM jobs").fetchall())
+    assert list(rows) == [1]
+    assert rows[1]
@@ -0,0 +1,109 @@
+import threading
+import time
+import types
+
+import pytest
+
+from main import RateLimiter
+
+
+class ReviewBrowser:
+    """WebDriver with tabs: records the URL loaded in each one, background tabs included."""
+
+    def __init__(self):
+        self.window_handles = ["main"]
+        self.current = "main"
+        self.loaded = {"main": None}
+        self.gets = []
+        self.preloaded = threading.Event()
+        self.switch_to = types.SimpleNamespace(window=self.switch)
+
+    def get(self, url):
+        self.gets.append(url)
+        self.loaded[self.current] = url
+
+    def execute_script(self, script, *args):
+        return False
+
+    def execute_cdp_cmd(self, command, params):
+        handle = f"tab-{len(self.loaded)}"
+        self.window_handles.append(handle)
+        self.loaded[handle] = params["url"]
+        self.preloaded.set()
+        return {"targetId": handle}
+
+    def close(self):
+        self.window_handles.remove(self.current)
+
+    def switch(self, handle):
+        self.current = handle
+
+    def quit(self):
+        pass
+
+
+@pytest.fixture
+def review(scrap, posting, job_details, monkeypatch):
+    for job_id in (1, 2, 3):
+        scrap.insert_job_details(job_details(job_id, posting(job_id), language="en", date_post=f"2024-01-0{job_id}"))
+    scrap.writer.flush()
+    scrap.rate_limiter = RateLimiter(60000)
+    scrap.drivers = [ReviewBrowser()]
+    return scrap
+
+
+def link(scrap, job_id):
+    return f"{scrap.base_url}/jobs/view/{job_id}"
+
+
+def answer(monkeypatch, *answers):
+    """Make input() call each of `answers` in turn and return what it returns."""
+    answers = list(answers)
+    monkeypatch.setattr("builtins.input", lambda prompt: answers.pop(0)())
+
+
+def test_next_job_is_preloaded_while_the_current_one_is_shown(review, monkeypatch):
+    driver = review.drivers[0]
+    monkeypatch.setattr(review, "check_liveness", lambda job: "open")
+
+    def first():
+        assert driver.preloaded.wait(5)
+        assert driver.loaded[driver.current] == link(review, 3)
+        assert driver.loaded["tab-1"] == link(review, 2)
+        return ""
+
+    def second():
+        # The preloaded tab is shown, without loading the job again
+        assert driver.current == "tab-1"
+        assert driver.window_handles[0] == "tab-1"
+        assert driver.gets == [link(review, 3)]
+        return "exit"
+
+    answer(monkeypatch, first, second)
+    review.navigate_jobs()
+    review.writer.flush()
+    applied = dict(review.conn.execute("SELECT Job_ID, applied FROM jobs").fetchall())
+    assert applied == {1: None, 2: None, 3: 1}
+
+
+def test_exit_does_not_wait_for_the_prefetch(review, monkeypatch):
+    driver = review.drivers[0]
+    release = threading.Event()
+
+    def check_liveness(job):
+        if job["Job_ID"] != 3:
+            release.wait(10)
+        return "open"
+    monkeypatch.setattr(review, "check_liveness", check_liveness)
+
+    def first():
+        # Throttled: the prefetch would wait for the backoff before preloading the next job
+        review.rate_limiter.blocked_until = time.monotonic() + 300
+        release.set()
+        return "exit"
+
+    answer(monkeypatch, first)
+    start = time.perf_counter()
+    review.navigate_jobs()
+    assert time.perf_counter() - start < 2
+    assert not driver.preloaded.wait(0.3)
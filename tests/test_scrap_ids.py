@@ -0,0 +1,34 @@
+import types
+
+from main import ScrapLinkedin
+
+
+def test_ids_inserted_by_this_run_stay_new(workdir):
+    with ScrapLinkedin("", "") as scrap:
+        scrap.insert_job_ids(["1"])
+    with ScrapLinkedin("", "") as scrap:
+        # Query A sees 2 and 3 first, then the overlapping query B sees them with 1, known from the previous run
+        assert scrap.unknown_job_ids(["2", "3"]) == [2, 3]
+        scrap.insert_job_ids(["2", "3"])
+        assert scrap.unknown_job_ids(["1", "2", "3"]) == [2, 3]
+        scrap.insert_job_ids(["1", "2", "3"])
+    with ScrapLinkedin("", "") as scrap:
+        assert scrap.unknown_job_ids(["1", "2", "3", "4"]) == [4]
+
+
+def test_checkpoint_counts_the_fetched_pages(scrap, monkeypatch):
+    fetched = []
+
+    def request_job_codes(start, posted_within=None, query=None, driver=None):
+        fetched.append(start)
+        return start
+
+    def job_ids(start):
+        return [str(job_id) for job_id in range(1000 - start, 1000 - start - 25, -1)]
+    monkeypatch.setattr(scrap, "request_job_codes", request_job_codes)
+    monkeypatch.setattr(scrap, "find_job_ids", job_ids)
+    scrap.job_extractor = types.SimpleNamespace(extract_search_page=lambda start: (200, job_ids(start)))
+    scrap.scrap_ids()
+    scrap.writer.flush()
+    assert len(fetched) == 8
+    assert scrap.conn.execute("SELECT last_seen_id, pages FROM crawl_checkpoints").fetchall() == [(1000, 8)]
@@ -0,0 +1,87 @@
+import threading
+import time
+import types
+
+from main import RateLimiter, ScrapLinkedin
+
+
+def test_concurrent_callers_start_one_browser_and_one_http_session(scrap, monkeypatch):
+    started = []
+
+    def connect_selenium(index=0, headless=None, lean=None):
+        time.sleep(0.05)
+        started.append(index)
+        return object()
+    monkeypatch.setattr(scrap, "connect_selenium", connect_selenium)
+    barrier = threading.Barrier(8)
+    fetchers = []
+
+    def worker():
+        barrier.wait()
+        fetchers.append(scrap.http)
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert started == [0]
+    assert len({id(fetcher) for fetcher in fetchers}) == 1
+    scrap.drivers = []
+
+
+class ThrottledBrowser:
+    """Shows "Too Many Requests" for the first `throttled` loads; the page source must never be serialized."""
+
+    def __init__(self, throttled):
+        self.throttled = throttled
+        self.loads = 0
+
+    def get(self, url):
+        self.loads += 1
+
+    def execute_script(self, script, *args):
+        # The throttle page is told apart from real pages by their job title or result list
+        assert args == (ScrapLinkedin.PAGE_CONTENT_SELECTOR,)
+        return self.loads <= self.throttled
+
+    @property
+    def page_source(self):
+        raise AssertionError("page_source was read")
+
+
+def test_browser_get_retries_while_throttled(scrap):
+    scrap.rate_limiter = RateLimiter(6000, base_backoff=0)
+    driver = ThrottledBrowser(throttled=2)
+    assert scrap.browser_get(driver, "http://localhost/jobs/view/1")
+    assert driver.loads == 3
+    assert scrap.rate_limiter.throttle_count == 2
+
+
+class StubFetcher:
+    """HttpFetcher answering the (status, html) `responses` in turn, the last one repeated."""
+
+    def __init__(self, responses):
+        self.responses = responses
+        self.requests = 0
+        self.session = types.SimpleNamespace(close=lambda: None)
+
+    def get(self, url):
+        self.requests += 1
+        return self.responses[min(self.requests, len(self.responses)) - 1]
+
+
+def test_job_mentioning_too_many_requests_is_not_a_throttle(scrap):
+    scrap.rate_limiter = RateLimiter(6000, base_backoff=0)
+    html = ("<html><body><h1 class='t-24 job-details-jobs-unified-top-card__job-title'>Backend Engineer</h1>"
+            "<p>Design APIs that answer 429 Too Many Requests gracefully.</p></body></html>")
+    scrap.http_fetcher = StubFetcher([(200, html)])
+    assert scrap.http_fetch("http://localhost/jobs/view/1") == (200, html)
+    assert scrap.http_fetcher.requests == 1
+    assert scrap.rate_limiter.report()["throttles"] == 0
+
+
+def test_429_status_is_a_throttle(scrap):
+    scrap.rate_limiter = RateLimiter(6000, base_backoff=0)
+    scrap.http_fetcher = StubFetcher([(429, ""), (200, "<html></html>")])
+    assert scrap.http_fetch("http://localhost/jobs/view/1") == (200, "<html></html>")
+    assert scrap.rate_limiter.report()["throttles"] == 1
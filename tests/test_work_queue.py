@@ -0,0 +1,119 @@
+import sqlite3
+import threading
+import time
+
+from main import ScrapLinkedin
+
+
+def queue_jobs(scrap, job_ids):
+    scrap.insert_job_ids([str(job_id) for job_id in job_ids])
+    scrap.list_ids_details()
+
+
+def states(scrap):
+    scrap.writer.flush()
+    return dict(scrap.conn.execute("SELECT Job_ID, state FROM work_queue").fetchall())
+
+
+def test_claims_newest_first_and_completes(scrap):
+    queue_jobs(scrap, [1, 2, 3])
+    assert scrap.work_queue.claim(2) == [(3, 1), (2, 1)]
+    scrap.work_queue.complete(3)
+    assert states(scrap) == {1: "pending", 2: "leased", 3: "done"}
+    assert scrap.work_queue.report() == {"done": 1, "leased": 1, "pending": 1, "ready": 1}
+
+
+def test_failed_item_is_retried_after_backoff(scrap):
+    scrap.work_queue.backoff = 0.3
+    queue_jobs(scrap, [1])
+    assert scrap.work_queue.claim(5) == [(1, 1)]
+    scrap.work_queue.fail(1, 1, "TimeoutError()")
+    assert states(scrap) == {1: "pending"}
+    assert scrap.work_queue.claim(5) == []
+    time.sleep(0.35)
+    assert scrap.work_queue.claim(5) == [(1, 2)]
+    assert scrap.conn.execute("SELECT last_error FROM work_queue").fetchone()[0] == "TimeoutError()"
+
+
+def test_item_is_dead_lettered_after_max_attempts(scrap):
+    scrap.work_queue.backoff = 0
+    scrap.work_queue.max_attempts = 2
+    queue_jobs(scrap, [1])
+    for attempt in (1, 2):
+        assert scrap.work_queue.claim(5) == [(1, attempt)]
+        scrap.work_queue.fail(1, attempt, "no company in the page")
+        scrap.writer.flush()
+    assert states(scrap) == {1: "dead"}
+    assert scrap.work_queue.claim(5) == []
+    # Dead items are not queued again by the next run
+    scrap.list_ids_details()
+    assert states(scrap) == {1: "dead"}
+
+
+def test_expired_lease_is_claimed_again(scrap):
+    queue_jobs(scrap, [1])
+    scrap.work_queue.lease_seconds = 0.2
+    assert scrap.work_queue.claim(5) == [(1, 1)]
+    assert scrap.work_queue.claim(5) == []
+    time.sleep(0.25)
+    assert scrap.work_queue.claim(5) == [(1, 2)]
+
+
+def test_release_gives_back_the_leases_without_counting_the_attempt(scrap):
+    queue_jobs(scrap, [1, 2])
+    assert scrap.work_queue.claim(1) == [(2, 1)]
+    scrap.work_queue.release()
+    assert scrap.work_queue.claim(1) == [(2, 1)]
+
+
+def test_two_connections_never_claim_the_same_item(scrap):
+    queue_jobs(scrap, range(1, 501))
+    with ScrapLinkedin("", "") as other:
+        other.work_queue.owner = "other"
+        claimed = {scrap.work_queue.owner: [], "other": []}
+        start = threading.Barrier(2)
+
+        def work(queue_):
+            start.wait()
+            while True:
+                items = queue_.claim(3)
+                if not items:
+                    break
+                claimed[queue_.owner] += [job_id for job_id, attempts in items]
+                for job_id, attempts in items:
+                    queue_.complete(job_id)
+                time.sleep(0.001)
+
+        threads = [threading.Thread(target=work, args=(queue_,)) for queue_ in (scrap.work_queue, other.work_queue)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        other.writer.flush()
+
+    first, second = claimed.values()
+    assert first and second
+    assert not set(first) & set(second)
+    assert sorted(first + second) == list(range(1, 501))
+    assert set(states(scrap).values()) == {"done"}
+
+
+def test_scrap_details_starts_no_browser_when_nothing_is_ready(scrap, monkeypatch):
+    def ensure_drivers(count):
+        raise AssertionError("a browser was started")
+    monkeypatch.setattr(scrap, "ensure_drivers", ensure_drivers)
+    scrap.scrap_details()
+
+
+def test_scrap_details_returns_when_a_worker_cannot_claim(scrap, monkeypatch):
+    queue_jobs(scrap, [1, 2])
+    scrap.engine = "http"
+
+    def claim(limit):
+        raise sqlite3.OperationalError("database is locked")
+    monkeypatch.setattr(scrap.work_queue, "claim", claim)
+    thread = threading.Thread(target=scrap.scrap_details, args=(2,), daemon=True)
+    thread.start()
+    thread.join(timeout=10)
+    assert not thread.is_alive()
+    assert states(scrap) == {1: "pending", 2: "pending"}